@@ -8,7 +8,7 @@ from typing import Any
 import structlog
 from kubernetes import client, config
 
-from src.core.config import settings
+from src.core.config import K8S_NAMESPACE, settings
 from src.core.models import ActionType, RemediationAction
 
 logger = structlog.get_logger()
@@ -46,19 +46,19 @@ class K8sExecutor:
 
         if action.action_type == ActionType.K8S_RESTART_POD:
             return await self.restart_pod(
-                namespace=params.get("namespace", settings.k8s_namespace),
+                namespace=params.get("namespace", K8S_NAMESPACE),
                 pod_name=params.get("pod_name", ""),
                 label_selector=params.get("label_selector"),
             )
         elif action.action_type == ActionType.K8S_SCALE_DEPLOYMENT:
             return await self.scale_deployment(
-                namespace=params.get("namespace", settings.k8s_namespace),
+                namespace=params.get("namespace", K8S_NAMESPACE),
                 deployment_name=params.get("deployment_name", ""),
                 replicas=params.get("replicas", 1),
             )
         elif action.action_type == ActionType.K8S_ROLLBACK:
             return await self.rollback_deployment(
-                namespace=params.get("namespace", settings.k8s_namespace),
+                namespace=params.get("namespace", K8S_NAMESPACE),
                 deployment_name=params.get("deployment_name", ""),
             )
         else:
@@ -76,7 +76,7 @@ class K8sExecutor:
         """
         self._ensure_initialized()
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         deleted_pods = []
 
         if pod_name:
@@ -142,7 +142,7 @@ class K8sExecutor:
             replicas=replicas,
         )
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         # Get current state
         deployment = await loop.run_in_executor(
@@ -195,7 +195,7 @@ class K8sExecutor:
             revision=revision,
         )
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         # Trigger rollout restart with timestamp annotation
         patch = {
@@ -237,7 +237,7 @@ class K8sExecutor:
         """Get pod logs for diagnosis."""
         self._ensure_initialized()
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
             None,
             partial(
@@ -257,7 +257,7 @@ class K8sExecutor:
         """Get events for a pod."""
         self._ensure_initialized()
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         events = await loop.run_in_executor(
             None,
             partial(
@@ -286,7 +286,7 @@ class K8sExecutor:
         """Get deployment status."""
         self._ensure_initialized()
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         deployment = await loop.run_in_executor(
             None,
             partial(
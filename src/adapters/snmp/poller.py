@@ -188,7 +188,7 @@ class SNMPPoller:
         """Poll SNMP OIDs from a host asynchronously."""
         logger.info("Polling SNMP", host=host, oids=oids)
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             results = await loop.run_in_executor(
                 _executor, self._sync_get, host, port, oids
@@ -205,7 +205,7 @@ class SNMPPoller:
         """Walk an SNMP OID tree asynchronously."""
         logger.info("Walking SNMP", host=host, oid=oid)
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             results = await loop.run_in_executor(
                 _executor, self._sync_walk, host, port, oid
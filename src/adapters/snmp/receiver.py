@@ -180,7 +180,7 @@ class SNMPTrapReceiverAsync:
 
     async def start(self) -> None:
         """Start the async SNMP trap receiver."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         # Create UDP endpoint
         self._transport, _ = await loop.create_datagram_endpoint(
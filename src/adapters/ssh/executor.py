@@ -59,7 +59,7 @@ class SSHExecutor:
 
     async def connect(self) -> None:
         """Establish SSH connection."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         self._client = paramiko.SSHClient()
         self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -96,7 +96,7 @@ class SSHExecutor:
 
         logger.info("Executing SSH command", host=self.host, command=command[:100])
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         start_time = datetime.utcnow()
 
         # Run in executor since paramiko is blocking
@@ -164,7 +164,7 @@ class SSHExecutor:
         if not self._client:
             await self.connect()
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         sftp = await loop.run_in_executor(
             None,
@@ -195,7 +195,7 @@ class SSHExecutor:
         if not self._client:
             await self.connect()
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         sftp = await loop.run_in_executor(
             None,
@@ -60,7 +60,7 @@ class SyslogReceiver:
 
     async def start(self) -> None:
         """Start the syslog receiver."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         self._transport, _ = await loop.create_datagram_endpoint(
             lambda: SyslogProtocol(self),
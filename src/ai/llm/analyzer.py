@@ -10,7 +10,7 @@ import anthropic
 import structlog
 
 from src.ai.rag import RunbookEntry, get_knowledge_base
-from src.core.config import settings
+from src.core.config import CLAUDE_MAX_TOKENS, CLAUDE_MODEL, settings
 from src.core.models import ActionType, AIAnalysis, Event
 
 logger = structlog.get_logger()
@@ -114,13 +114,13 @@ class AlertAnalyzer:
 
         try:
             # Run sync API call in thread pool
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             response = await loop.run_in_executor(
                 _executor,
                 partial(
                     self.client.messages.create,
-                    model=settings.claude_model,
-                    max_tokens=settings.claude_max_tokens,
+                    model=CLAUDE_MODEL,
+                    max_tokens=CLAUDE_MAX_TOKENS,
                     system=SYSTEM_PROMPT,
                     messages=[{"role": "user", "content": prompt}],
                 ),
@@ -1,5 +1,11 @@
 """RAG (Retrieval Augmented Generation) for runbook knowledge base."""
 
+from src.ai.rag.batcher import (
+    EmbeddingBatcher,
+    close_embedding_batcher,
+    get_embedding_batcher,
+)
+from src.ai.rag.cache import SearchCache
 from src.ai.rag.knowledge_base import (
     CHROMADB_AVAILABLE,
     DEFAULT_RUNBOOKS,
@@ -11,15 +17,21 @@ from src.ai.rag.knowledge_base import (
     create_default_knowledge_base,
     get_knowledge_base,
 )
+from src.ai.rag.vectors import InMemoryVectorIndex
 
 __all__ = [
     "KnowledgeBase",
     "VectorKnowledgeBase",
     "RunbookEntry",
     "SearchResult",
+    "SearchCache",
+    "InMemoryVectorIndex",
+    "EmbeddingBatcher",
     "DEFAULT_RUNBOOKS",
     "CHROMADB_AVAILABLE",
     "EMBEDDINGS_AVAILABLE",
     "create_default_knowledge_base",
     "get_knowledge_base",
+    "get_embedding_batcher",
+    "close_embedding_batcher",
 ]
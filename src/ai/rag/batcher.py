@@ -0,0 +1,115 @@
+"""Dynamic batching of query embeddings off the event loop."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+import structlog
+
+from src.ai.rag.knowledge_base import get_knowledge_base
+
+logger = structlog.get_logger()
+
+
+class EmbeddingBatcher:
+    """Batches concurrent embedding requests into single encoder calls.
+
+    Requests are collected until ``max_batch_size`` are pending or
+    ``max_wait_ms`` has passed since the first one, then encoded together on a
+    dedicated worker thread so the event loop never runs the model itself.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self._embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedder")
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future[Any]]] | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, text: str) -> Any:
+        """Embed a single text, batched with any concurrent requests."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future: asyncio.Future[Any] = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the batching worker and its thread."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    async def _run(self) -> None:
+        """Drain the queue in batches and resolve each caller's future."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await loop.run_in_executor(
+                    self._executor,
+                    partial(
+                        self._embedder.encode,
+                        texts,
+                        batch_size=len(texts),
+                        convert_to_numpy=True,
+                    ),
+                )
+            except Exception as e:
+                logger.error("Batched embedding failed", batch_size=len(texts), error=str(e))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings, strict=True):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+# Singleton instance
+_embedding_batcher: EmbeddingBatcher | None = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher | None:
+    """Get the global embedding batcher, or None if semantic search is unavailable."""
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        kb = get_knowledge_base()
+        if kb.semantic_search_enabled:
+            _embedding_batcher = EmbeddingBatcher(kb.embedder)
+    return _embedding_batcher
+
+
+async def close_embedding_batcher() -> None:
+    """Shut down the global embedding batcher if it was started."""
+    global _embedding_batcher
+    if _embedding_batcher is not None:
+        await _embedding_batcher.close()
+        _embedding_batcher = None
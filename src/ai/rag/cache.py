@@ -0,0 +1,112 @@
+"""Query cache for knowledge base searches."""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from src.ai.rag.vectors import NUMPY_AVAILABLE, normalize
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+if TYPE_CHECKING:
+    from src.ai.rag.knowledge_base import SearchResult
+
+# (query, sorted tags, top_k, use_semantic)
+SearchKey = tuple[str, tuple[str, ...], int, bool]
+
+
+class SearchCache:
+    """Two-tier LRU cache in front of knowledge base search.
+
+    The exact tier is keyed by the normalized search request. When a query
+    embedding is supplied, the semantic tier also serves near-duplicate
+    queries whose embeddings are within ``similarity_threshold`` cosine
+    similarity of a cached query with the same tags/top_k/use_semantic.
+
+    Entries are tied to a knowledge base generation; any change to the
+    knowledge base bumps the generation and drops every cached result.
+    """
+
+    def __init__(self, maxsize: int = 256, similarity_threshold: float = 0.95) -> None:
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self._entries: OrderedDict[SearchKey, list[SearchResult]] = OrderedDict()
+        self._embeddings: dict[SearchKey, Any] = {}
+        self._matrix: Any = None
+        self._matrix_keys: list[SearchKey] = []
+        self._generation = 0
+
+    @staticmethod
+    def make_key(
+        query: str,
+        tags: list[str] | None,
+        top_k: int,
+        use_semantic: bool,
+    ) -> SearchKey:
+        """Build a cache key for a search request."""
+        return (query, tuple(sorted(tags or ())), top_k, use_semantic)
+
+    def get(self, key: SearchKey, generation: int) -> list["SearchResult"] | None:
+        """Return cached results for an exact key, if any."""
+        self._sync(generation)
+        results = self._entries.get(key)
+        if results is not None:
+            self._entries.move_to_end(key)
+        return results
+
+    def get_similar(
+        self, key: SearchKey, embedding: Any, generation: int
+    ) -> list["SearchResult"] | None:
+        """Return cached results for a semantically equivalent query, if any."""
+        self._sync(generation)
+        if not NUMPY_AVAILABLE or embedding is None or not self._embeddings:
+            return None
+
+        if self._matrix is None:
+            self._matrix_keys = list(self._embeddings)
+            self._matrix = np.vstack([self._embeddings[k] for k in self._matrix_keys])
+
+        similarities = self._matrix @ normalize(embedding)
+        for i in np.argsort(-similarities):
+            if similarities[i] < self.similarity_threshold:
+                break
+            candidate = self._matrix_keys[i]
+            if candidate[1:] == key[1:]:
+                return self.get(candidate, generation)
+        return None
+
+    def put(
+        self,
+        key: SearchKey,
+        results: list["SearchResult"],
+        generation: int,
+        embedding: Any = None,
+    ) -> None:
+        """Store search results, evicting the least recently used entry if full."""
+        self._sync(generation)
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+        if NUMPY_AVAILABLE and embedding is not None:
+            self._embeddings[key] = normalize(embedding)
+            self._matrix = None
+
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._embeddings.pop(evicted, None) is not None:
+                self._matrix = None
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+        self._embeddings.clear()
+        self._matrix = None
+        self._matrix_keys = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync(self, generation: int) -> None:
+        """Invalidate the cache if the knowledge base has changed."""
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
@@ -2,12 +2,15 @@
 
 import hashlib
 import json
-from dataclasses import asdict, dataclass, field
+import os
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import structlog
 
+from src.ai.rag.vectors import NUMPY_AVAILABLE, InMemoryVectorIndex
 from src.core.config import settings
 
 logger = structlog.get_logger()
@@ -30,8 +33,52 @@ except ImportError:
     EMBEDDINGS_AVAILABLE = False
     logger.warning("sentence-transformers not installed, using pattern matching only")
 
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def load_embedder(model_name: str, backend: str = "torch") -> Any:
+    """Load the sentence embedding model.
+
+    With ``backend="onnx"`` the model runs on ONNX Runtime using the INT8
+    quantized export configured by ``settings.embedding_onnx_file``, falling
+    back to PyTorch if the ONNX backend cannot be loaded.
+    """
+    if backend == "onnx":
+        try:
+            return SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={
+                    "file_name": settings.embedding_onnx_file,
+                    "provider": "CPUExecutionProvider",
+                    "session_options": _onnx_session_options(),
+                },
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to load ONNX embedding model, falling back to PyTorch",
+                model=model_name,
+                error=str(e),
+            )
+    return SentenceTransformer(model_name)
+
 
-@dataclass
+def _onnx_session_options() -> Any:
+    """Build ONNX Runtime session options tuned for CPU inference."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+    return options
+
+
+@dataclass(slots=True)
 class RunbookEntry:
     """A runbook entry in the knowledge base."""
 
@@ -46,6 +93,14 @@ class RunbookEntry:
     confidence_threshold: float = 0.7
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    # Lowercased copies used by the indexes, computed once per entry
+    patterns_lower: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    tags_lower: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.patterns_lower = tuple(p.lower() for p in self.alert_patterns if p)
+        self.tags_lower = tuple(t.lower() for t in self.tags)
+
     def to_document(self) -> str:
         """Convert runbook to searchable document text."""
         parts = [
@@ -59,13 +114,48 @@ class RunbookEntry:
             parts.append(f"Severity Hints: {', '.join(self.severity_hints)}")
         return "\n".join(parts)
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunbookEntry":
+        """Create a runbook from an imported dictionary."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            alert_patterns=data.get("alert_patterns", []),
+            content=data.get("content", ""),
+            remediation_steps=data.get("remediation_steps", []),
+            tags=data.get("tags", []),
+            severity_hints=data.get("severity_hints", []),
+            auto_remediate=data.get("auto_remediate", False),
+            confidence_threshold=data.get("confidence_threshold", 0.7),
+            metadata=data.get("metadata", {}),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the runbook fields as a dictionary.
+
+        Unlike ``dataclasses.asdict`` this does not deep-copy; lists and the
+        metadata dict are shared with the runbook and must not be mutated.
+        """
+        return {
+            "id": self.id,
+            "title": self.title,
+            "alert_patterns": self.alert_patterns,
+            "content": self.content,
+            "remediation_steps": self.remediation_steps,
+            "tags": self.tags,
+            "severity_hints": self.severity_hints,
+            "auto_remediate": self.auto_remediate,
+            "confidence_threshold": self.confidence_threshold,
+            "metadata": self.metadata,
+        }
+
     def content_hash(self) -> str:
         """Generate hash of runbook content for change detection."""
-        content = json.dumps(asdict(self), sort_keys=True)
+        content = json.dumps(self.to_dict(), sort_keys=True)
         return hashlib.md5(content.encode()).hexdigest()
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Result from knowledge base search."""
 
@@ -81,16 +171,26 @@ class VectorKnowledgeBase:
         self,
         persist_directory: str | None = None,
         collection_name: str = "runbooks",
-        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_model: str | None = None,
+        embedding_backend: str | None = None,
     ) -> None:
+        embedding_model = embedding_model or settings.embedding_model
+        embedding_backend = embedding_backend or settings.embedding_backend
         self.collection_name = collection_name
         self.embedding_model_name = embedding_model
         self._runbooks: dict[str, RunbookEntry] = {}
         self._pattern_index: dict[str, list[str]] = {}
-        self._tag_index: dict[str, list[str]] = {}
+        self._automaton: tuple[int, Any] | None = None
+        self._tag_index: dict[str, set[str]] = {}
+        self._all_tags: set[str] = set()
         self._embedder: Any = None
         self._collection: Any = None
         self._client: Any = None
+        self._vector_index: InMemoryVectorIndex | None = None
+        self._generation = 0
+        # Bulk imports run in a worker thread, so every write to the indexes
+        # and vector store is serialized; embedding happens outside the lock
+        self._write_lock = threading.Lock()
 
         # Initialize vector store if available
         if CHROMADB_AVAILABLE:
@@ -121,129 +221,233 @@ class VectorKnowledgeBase:
         # Initialize embedding model if available
         if EMBEDDINGS_AVAILABLE:
             try:
-                self._embedder = SentenceTransformer(embedding_model)
-                logger.info("Embedding model loaded", model=embedding_model)
+                self._embedder = load_embedder(embedding_model, embedding_backend)
+                logger.info(
+                    "Embedding model loaded",
+                    model=embedding_model,
+                    backend=embedding_backend,
+                )
             except Exception as e:
                 logger.error("Failed to load embedding model", error=str(e))
                 self._embedder = None
 
+        # Without ChromaDB, keep embeddings in memory so semantic search still works
+        if self._embedder is not None and self._collection is None and NUMPY_AVAILABLE:
+            self._vector_index = InMemoryVectorIndex()
+            logger.info("Using in-memory vector index")
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every change, used to invalidate search caches."""
+        return self._generation
+
+    @property
+    def embedder(self) -> Any:
+        """The sentence embedding model, or None if unavailable."""
+        return self._embedder
+
+    @property
+    def semantic_search_enabled(self) -> bool:
+        """Whether vector search is available."""
+        return self._embedder is not None and (
+            self._collection is not None or self._vector_index is not None
+        )
+
     def add_runbook(self, runbook: RunbookEntry) -> None:
         """Add a runbook to the knowledge base."""
-        self._runbooks[runbook.id] = runbook
+        self._add_runbooks([runbook], batch_size=1)
+        logger.info("Added runbook", id=runbook.id, title=runbook.title)
 
-        # Index by alert patterns
-        for pattern in runbook.alert_patterns:
-            pattern_lower = pattern.lower()
-            if pattern_lower not in self._pattern_index:
-                self._pattern_index[pattern_lower] = []
-            if runbook.id not in self._pattern_index[pattern_lower]:
-                self._pattern_index[pattern_lower].append(runbook.id)
+    def add_runbooks_bulk(
+        self, runbooks: list[RunbookEntry], batch_size: int = 200
+    ) -> int:
+        """Add many runbooks at once, embedding and upserting them in batches.
 
-        # Index by tags
-        for tag in runbook.tags:
-            tag_lower = tag.lower()
-            if tag_lower not in self._tag_index:
-                self._tag_index[tag_lower] = []
-            if runbook.id not in self._tag_index[tag_lower]:
-                self._tag_index[tag_lower].append(runbook.id)
-
-        # Add to vector store if available
-        if self._collection is not None and self._embedder is not None:
+        Duplicate IDs within ``runbooks`` are collapsed (the last entry wins).
+        Safe to call from a worker thread. Returns the number of runbooks added.
+        """
+        unique = list({runbook.id: runbook for runbook in runbooks}.values())
+        if not unique:
+            return 0
+
+        self._add_runbooks(unique, batch_size)
+        logger.info("Added runbooks", count=len(unique))
+        return len(unique)
+
+    def _add_runbooks(self, runbooks: list[RunbookEntry], batch_size: int) -> None:
+        """Embed runbooks, then index and upsert them under the write lock."""
+        documents: list[str] = []
+        embeddings: Any = None
+        if self.semantic_search_enabled:
             try:
-                document = runbook.to_document()
-                embedding = self._embedder.encode(document).tolist()
-                self._collection.upsert(
-                    ids=[runbook.id],
-                    documents=[document],
-                    embeddings=[embedding],
-                    metadatas=[
-                        {
-                            "title": runbook.title,
-                            "tags": ",".join(runbook.tags),
-                            "auto_remediate": runbook.auto_remediate,
-                            "content_hash": runbook.content_hash(),
-                        }
-                    ],
+                documents = [runbook.to_document() for runbook in runbooks]
+                embeddings = self._embedder.encode(
+                    documents, batch_size=64, convert_to_numpy=True
                 )
             except Exception as e:
                 logger.error(
-                    "Failed to add runbook to vector store",
-                    runbook_id=runbook.id,
+                    "Failed to embed runbooks",
+                    count=len(runbooks),
                     error=str(e),
                 )
 
-        logger.info("Added runbook", id=runbook.id, title=runbook.title)
+        with self._write_lock:
+            for runbook in runbooks:
+                self._index_runbook(runbook)
+
+            if embeddings is not None:
+                try:
+                    self._upsert_vectors(runbooks, documents, embeddings, batch_size)
+                except Exception as e:
+                    logger.error(
+                        "Failed to add runbooks to vector store",
+                        count=len(runbooks),
+                        error=str(e),
+                    )
+
+    def _upsert_vectors(
+        self,
+        runbooks: list[RunbookEntry],
+        documents: list[str],
+        embeddings: Any,
+        batch_size: int,
+    ) -> None:
+        """Write runbook embeddings to ChromaDB or the in-memory index."""
+        if self._collection is None:
+            self._vector_index.upsert([runbook.id for runbook in runbooks], embeddings)
+            return
+
+        embeddings = embeddings.tolist()
+        for start in range(0, len(runbooks), batch_size):
+            end = start + batch_size
+            batch = runbooks[start:end]
+            self._collection.upsert(
+                ids=[runbook.id for runbook in batch],
+                documents=documents[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=[self._vector_metadata(runbook) for runbook in batch],
+            )
+
+    def _index_runbook(self, runbook: RunbookEntry) -> None:
+        """Add a runbook to the in-memory pattern and tag indexes."""
+        self._runbooks[runbook.id] = runbook
+        self._generation += 1
+
+        # Index by alert patterns
+        self._automaton = None
+        for pattern_lower in runbook.patterns_lower:
+            if pattern_lower not in self._pattern_index:
+                self._pattern_index[pattern_lower] = []
+            if runbook.id not in self._pattern_index[pattern_lower]:
+                self._pattern_index[pattern_lower].append(runbook.id)
+
+        # Index by tags
+        for tag_lower in runbook.tags_lower:
+            self._tag_index.setdefault(tag_lower, set()).add(runbook.id)
+            self._all_tags.add(tag_lower)
+
+    @staticmethod
+    def _vector_metadata(runbook: RunbookEntry) -> dict[str, Any]:
+        """Build the vector store metadata for a runbook."""
+        return {
+            "title": runbook.title,
+            "tags": ",".join(runbook.tags),
+            "auto_remediate": runbook.auto_remediate,
+            "content_hash": runbook.content_hash(),
+        }
 
     def remove_runbook(self, runbook_id: str) -> bool:
         """Remove a runbook from the knowledge base."""
-        if runbook_id not in self._runbooks:
-            return False
-
-        runbook = self._runbooks.pop(runbook_id)
-
-        # Remove from pattern index
-        for pattern in runbook.alert_patterns:
-            pattern_lower = pattern.lower()
-            if pattern_lower in self._pattern_index:
-                self._pattern_index[pattern_lower] = [
-                    rid
-                    for rid in self._pattern_index[pattern_lower]
-                    if rid != runbook_id
-                ]
-
-        # Remove from tag index
-        for tag in runbook.tags:
-            tag_lower = tag.lower()
-            if tag_lower in self._tag_index:
-                self._tag_index[tag_lower] = [
-                    rid for rid in self._tag_index[tag_lower] if rid != runbook_id
-                ]
-
-        # Remove from vector store
-        if self._collection is not None:
-            try:
-                self._collection.delete(ids=[runbook_id])
-            except Exception as e:
-                logger.error(
-                    "Failed to remove runbook from vector store",
-                    runbook_id=runbook_id,
-                    error=str(e),
-                )
+        with self._write_lock:
+            if runbook_id not in self._runbooks:
+                return False
+
+            runbook = self._runbooks.pop(runbook_id)
+            self._generation += 1
+
+            # Remove from pattern index
+            self._automaton = None
+            for pattern_lower in runbook.patterns_lower:
+                if pattern_lower in self._pattern_index:
+                    remaining = [
+                        rid
+                        for rid in self._pattern_index[pattern_lower]
+                        if rid != runbook_id
+                    ]
+                    if remaining:
+                        self._pattern_index[pattern_lower] = remaining
+                    else:
+                        del self._pattern_index[pattern_lower]
+
+            # Remove from tag index
+            for tag_lower in runbook.tags_lower:
+                tagged = self._tag_index.get(tag_lower)
+                if tagged is not None:
+                    tagged.discard(runbook_id)
+                    if not tagged:
+                        del self._tag_index[tag_lower]
+                        self._all_tags.discard(tag_lower)
+
+            # Remove from vector store
+            if self._vector_index is not None:
+                self._vector_index.delete(runbook_id)
+            if self._collection is not None:
+                try:
+                    self._collection.delete(ids=[runbook_id])
+                except Exception as e:
+                    logger.error(
+                        "Failed to remove runbook from vector store",
+                        runbook_id=runbook_id,
+                        error=str(e),
+                    )
 
         logger.info("Removed runbook", id=runbook_id)
         return True
 
     def semantic_search(
-        self, query: str, top_k: int = 5, min_score: float = 0.3
+        self,
+        query: str,
+        top_k: int = 5,
+        min_score: float = 0.3,
+        query_embedding: Any = None,
     ) -> list[SearchResult]:
-        """Search runbooks using semantic similarity."""
-        if self._collection is None or self._embedder is None:
+        """Search runbooks using semantic similarity.
+
+        A precomputed ``query_embedding`` may be passed to skip encoding the query.
+        """
+        if not self.semantic_search_enabled:
             logger.debug("Vector search unavailable, falling back to pattern search")
             return []
 
         try:
-            query_embedding = self._embedder.encode(query).tolist()
-            results = self._collection.query(
-                query_embeddings=[query_embedding],
-                n_results=min(top_k, len(self._runbooks)),
-                include=["distances", "metadatas"],
-            )
+            if query_embedding is None:
+                query_embedding = self._embedder.encode(query)
 
-            search_results = []
-            if results["ids"] and results["distances"]:
-                for i, runbook_id in enumerate(results["ids"][0]):
+            if self._collection is None:
+                hits = self._vector_index.query(query_embedding, top_k)
+            else:
+                results = self._collection.query(
+                    query_embeddings=[query_embedding.tolist()],
+                    n_results=min(top_k, len(self._runbooks)),
+                    include=["distances", "metadatas"],
+                )
+                hits = []
+                if results["ids"] and results["distances"]:
                     # ChromaDB returns cosine distance, convert to similarity
-                    distance = results["distances"][0][i]
-                    score = 1 - distance  # cosine similarity
-
-                    if score >= min_score and runbook_id in self._runbooks:
-                        search_results.append(
-                            SearchResult(
-                                runbook=self._runbooks[runbook_id],
-                                score=score,
-                                match_type="semantic",
-                            )
+                    hits = [
+                        (runbook_id, 1 - distance)
+                        for runbook_id, distance in zip(
+                            results["ids"][0], results["distances"][0], strict=True
                         )
+                    ]
+
+            search_results = []
+            for runbook_id, score in hits:
+                runbook = self._runbooks.get(runbook_id)
+                if score >= min_score and runbook is not None:
+                    search_results.append(
+                        SearchResult(runbook=runbook, score=score, match_type="semantic")
+                    )
 
             return search_results
         except Exception as e:
@@ -251,51 +455,66 @@ class VectorKnowledgeBase:
             return []
 
     def pattern_search(self, alert_text: str) -> list[SearchResult]:
-        """Search runbooks using pattern matching."""
+        """Search runbooks using pattern matching.
+
+        Like the other search methods this may run in a worker thread while
+        runbooks are added or removed, so index lookups tolerate missing keys.
+        """
         alert_lower = alert_text.lower()
         matching_ids: dict[str, float] = {}
+        if not self._pattern_index:
+            return []
 
-        for pattern, runbook_ids in self._pattern_index.items():
-            if pattern in alert_lower:
-                # Score based on pattern length relative to alert
-                score = len(pattern) / len(alert_lower)
-                for rid in runbook_ids:
-                    if rid not in matching_ids or matching_ids[rid] < score:
-                        matching_ids[rid] = score
-
-        return [
-            SearchResult(
-                runbook=self._runbooks[rid],
-                score=score,
-                match_type="pattern",
-            )
-            for rid, score in sorted(
-                matching_ids.items(), key=lambda x: x[1], reverse=True
-            )
-            if rid in self._runbooks
-        ]
+        for pattern in self._matching_patterns(alert_lower):
+            # Score based on pattern length relative to alert
+            score = len(pattern) / len(alert_lower)
+            for rid in self._pattern_index.get(pattern, ()):
+                if rid not in matching_ids or matching_ids[rid] < score:
+                    matching_ids[rid] = score
+
+        return self._to_results(matching_ids, "pattern")
+
+    def _matching_patterns(self, alert_lower: str) -> set[str] | list[str]:
+        """Find every indexed pattern that occurs in the lowercased alert text.
+
+        Uses an Aho-Corasick automaton (rebuilt lazily after index changes)
+        when pyahocorasick is installed, so the alert is scanned once
+        regardless of how many patterns are indexed.
+        """
+        if not AHOCORASICK_AVAILABLE:
+            return [pattern for pattern in list(self._pattern_index) if pattern in alert_lower]
+
+        # Tagged with the generation it was built from, so an automaton built
+        # concurrently with a write is never mistaken for a current one
+        generation = self._generation
+        if self._automaton is None or self._automaton[0] != generation:
+            automaton = ahocorasick.Automaton()
+            for pattern in list(self._pattern_index):
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._automaton = (generation, automaton)
+        return {pattern for _, pattern in self._automaton[1].iter(alert_lower)}
 
     def tag_search(self, tags: list[str]) -> list[SearchResult]:
         """Search runbooks by tags."""
         matching_ids: dict[str, int] = {}
 
         for tag in tags:
-            tag_lower = tag.lower()
-            if tag_lower in self._tag_index:
-                for rid in self._tag_index[tag_lower]:
-                    matching_ids[rid] = matching_ids.get(rid, 0) + 1
-
-        return [
-            SearchResult(
-                runbook=self._runbooks[rid],
-                score=count / len(tags),
-                match_type="tag",
-            )
-            for rid, count in sorted(
-                matching_ids.items(), key=lambda x: x[1], reverse=True
-            )
-            if rid in self._runbooks
-        ]
+            for rid in tuple(self._tag_index.get(tag.lower(), ())):
+                matching_ids[rid] = matching_ids.get(rid, 0) + 1
+
+        return self._to_results(
+            {rid: count / len(tags) for rid, count in matching_ids.items()}, "tag"
+        )
+
+    def _to_results(self, scores: dict[str, float], match_type: str) -> list[SearchResult]:
+        """Build search results for runbooks that still exist, best score first."""
+        results = []
+        for rid, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
+            runbook = self._runbooks.get(rid)
+            if runbook is not None:
+                results.append(SearchResult(runbook=runbook, score=score, match_type=match_type))
+        return results
 
     def search(
         self,
@@ -303,13 +522,16 @@ class VectorKnowledgeBase:
         tags: list[str] | None = None,
         top_k: int = 5,
         use_semantic: bool = True,
+        query_embedding: Any = None,
     ) -> list[SearchResult]:
         """Combined search using multiple strategies."""
         all_results: dict[str, SearchResult] = {}
 
         # Semantic search (highest priority if available)
         if use_semantic:
-            semantic_results = self.semantic_search(query, top_k=top_k)
+            semantic_results = self.semantic_search(
+                query, top_k=top_k, query_embedding=query_embedding
+            )
             for result in semantic_results:
                 key = result.runbook.id
                 if key not in all_results or result.score > all_results[key].score:
@@ -351,9 +573,17 @@ class VectorKnowledgeBase:
         """Get a runbook by ID."""
         return self._runbooks.get(runbook_id)
 
-    def list_runbooks(self) -> list[RunbookEntry]:
-        """List all runbooks."""
-        return list(self._runbooks.values())
+    def list_runbooks(self, tag: str | None = None) -> list[RunbookEntry]:
+        """List all runbooks, optionally filtered by tag (case-insensitive)."""
+        if tag is None:
+            return list(self._runbooks.values())
+
+        runbook_ids = self._tag_index.get(tag.lower(), ())
+        return [self._runbooks[rid] for rid in sorted(runbook_ids)]
+
+    def list_tags(self) -> list[str]:
+        """List all unique (lowercased) tags in the knowledge base."""
+        return sorted(self._all_tags)
 
     def format_for_context(self, runbooks: list[RunbookEntry]) -> str:
         """Format runbooks for LLM context."""
@@ -405,23 +635,8 @@ class VectorKnowledgeBase:
             with open(path) as f:
                 data = json.load(f)
 
-            count = 0
-            runbooks = data if isinstance(data, list) else data.get("runbooks", [])
-            for item in runbooks:
-                runbook = RunbookEntry(
-                    id=item["id"],
-                    title=item["title"],
-                    alert_patterns=item.get("alert_patterns", []),
-                    content=item.get("content", ""),
-                    remediation_steps=item.get("remediation_steps", []),
-                    tags=item.get("tags", []),
-                    severity_hints=item.get("severity_hints", []),
-                    auto_remediate=item.get("auto_remediate", False),
-                    confidence_threshold=item.get("confidence_threshold", 0.7),
-                    metadata=item.get("metadata", {}),
-                )
-                self.add_runbook(runbook)
-                count += 1
+            items = data if isinstance(data, list) else data.get("runbooks", [])
+            count = self.add_runbooks_bulk([RunbookEntry.from_dict(item) for item in items])
 
             logger.info("Imported runbooks from file", path=file_path, count=count)
             return count
@@ -432,7 +647,7 @@ class VectorKnowledgeBase:
     def export_to_file(self, file_path: str) -> bool:
         """Export runbooks to a JSON file."""
         try:
-            data = {"runbooks": [asdict(rb) for rb in self._runbooks.values()]}
+            data = {"runbooks": [rb.to_dict() for rb in self._runbooks.values()]}
             with open(file_path, "w") as f:
                 json.dump(data, f, indent=2)
             logger.info("Exported runbooks to file", path=file_path, count=len(self._runbooks))
@@ -630,8 +845,7 @@ def create_default_knowledge_base(
 ) -> VectorKnowledgeBase:
     """Create a knowledge base with default runbooks."""
     kb = VectorKnowledgeBase(persist_directory=persist_directory)
-    for runbook in DEFAULT_RUNBOOKS:
-        kb.add_runbook(runbook)
+    kb.add_runbooks_bulk(DEFAULT_RUNBOOKS)
     return kb
 
 
@@ -0,0 +1,70 @@
+"""In-memory vector index used when ChromaDB is unavailable."""
+
+from typing import Any
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def normalize(embedding: Any) -> Any:
+    """Return an embedding as a flat float32 unit vector (zero vectors unchanged)."""
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class InMemoryVectorIndex:
+    """Brute-force cosine similarity index over runbook embeddings.
+
+    Vectors are normalized on insert and stacked into a single matrix on the
+    first query after a change, so a query is one matrix-vector product plus
+    a partial sort for the top-k.
+    """
+
+    def __init__(self) -> None:
+        self._vectors: dict[str, Any] = {}
+        self._version = 0
+        self._snapshot: tuple[int, list[str], Any] | None = None
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def upsert(self, ids: list[str], embeddings: Any) -> None:
+        """Insert or replace the embeddings for the given IDs."""
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        for vector_id, vector in zip(ids, matrix, strict=True):
+            self._vectors[vector_id] = vector
+        self._version += 1
+
+    def delete(self, vector_id: str) -> None:
+        """Remove an embedding if present."""
+        if self._vectors.pop(vector_id, None) is not None:
+            self._version += 1
+
+    def query(self, embedding: Any, top_k: int) -> list[tuple[str, float]]:
+        """Return up to ``top_k`` (id, cosine similarity) pairs, best first."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != self._version:
+            # Tagged with the version it was built from, so a snapshot built
+            # concurrently with a write is rebuilt rather than reused
+            version = self._version
+            items = list(self._vectors.items())
+            if not items:
+                return []
+            snapshot = (version, [i for i, _ in items], np.vstack([v for _, v in items]))
+            self._snapshot = snapshot
+
+        _, ids, matrix = snapshot
+        scores = matrix @ normalize(embedding)
+        k = min(top_k, len(ids))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[i], float(scores[i])) for i in top]
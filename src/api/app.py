@@ -1,17 +1,26 @@
 """FastAPI application."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.ai.rag import close_embedding_batcher, get_knowledge_base
 from src.api.routes import events, health
 from src.api.routes.approvals import router as approvals_router
 from src.api.routes.runbooks import router as runbooks_router
+from src.core.config import settings
 from src.dashboard.router import router as dashboard_router
+from src.dashboard.router import warm_templates
 from src.workflows.approval import get_approval_service
 from src.workflows.slack import get_slack_notifier
 
+# Maximum concurrent worker threads for blocking calls
+THREAD_LIMIT = 32
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -19,6 +28,24 @@ async def lifespan(app: FastAPI):
     from src.core.event_processor import get_event_processor
 
     # Startup
+    # Bound the worker threads shared by sync endpoints and offloaded searches
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_LIMIT
+    # Executors and adapters offload blocking I/O to the loop's default executor, whose
+    # CPU-based size is too small when many remediations wait on the network at once
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=settings.blocking_io_workers, thread_name_prefix="blocking-io"
+        )
+    )
+
+    # Load the knowledge base (and its embedding model) before serving requests
+    app.state.knowledge_base = get_knowledge_base()
+
+    # Compile dashboard templates so the first page views and HTMX polls are not slowed
+    warm_templates()
+    # Dashboard templates render here so page views don't compete with the default executor
+    app.state.dashboard_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+
     approval_service = get_approval_service()
     slack_notifier = get_slack_notifier()
     event_processor = get_event_processor()
@@ -27,8 +54,9 @@ async def lifespan(app: FastAPI):
     if slack_notifier.is_available:
         approval_service.set_notifier(slack_notifier)
 
-    # Connect event processor to approval service
+    # Connect event processor to approval service and knowledge base
     event_processor.set_approval_service(approval_service)
+    event_processor.set_knowledge_base(app.state.knowledge_base)
 
     # Start services
     await approval_service.start()
@@ -39,6 +67,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     await event_processor.stop()
     await approval_service.stop()
+    await slack_notifier.close()
+    await close_embedding_batcher()
+    app.state.dashboard_executor.shutdown(wait=False)
 
 
 def create_app() -> FastAPI:
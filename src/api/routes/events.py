@@ -1,11 +1,11 @@
 """Event ingestion endpoints."""
 
 from typing import Any
-from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException
 
 from src.core.event_processor import get_event_processor
+from src.core.ids import new_id
 from src.core.models import Event, EventSeverity, EventSource
 
 router = APIRouter()
@@ -76,7 +76,7 @@ async def alertmanager_webhook(payload: dict[str, Any]) -> dict:
 
     for alert in payload.get("alerts", []):
         event = Event(
-            id=str(uuid4()),
+            id=new_id(),
             source=EventSource.ALERTMANAGER,
             severity=severity_map.get(
                 alert.get("labels", {}).get("severity", "info"),
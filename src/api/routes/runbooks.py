@@ -1,22 +1,38 @@
 """API routes for runbook knowledge base management."""
 
+import asyncio
+from collections.abc import Iterator
+from functools import partial
 from typing import Any
 
+import orjson
 import structlog
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from src.ai.rag import (
     CHROMADB_AVAILABLE,
     EMBEDDINGS_AVAILABLE,
     RunbookEntry,
+    SearchCache,
     SearchResult,
-    get_knowledge_base,
+    VectorKnowledgeBase,
+    get_embedding_batcher,
 )
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Cache of recent search results, invalidated whenever the knowledge base changes
+_search_cache = SearchCache()
+
+
+async def knowledge_base(request: Request) -> VectorKnowledgeBase:
+    """Dependency returning the knowledge base created at application startup."""
+    return request.app.state.knowledge_base
+
 
 class RunbookCreate(BaseModel):
     """Request model for creating a runbook."""
@@ -48,9 +64,17 @@ class RunbookCreate(BaseModel):
     )
 
 
+class RunbookImport(RunbookCreate):
+    """A runbook entry in an import document; content may be omitted."""
+
+    content: str = Field(default="", description="Main content of the runbook")
+
+
 class RunbookResponse(BaseModel):
     """Response model for a runbook."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     alert_patterns: list[str]
@@ -77,6 +101,8 @@ class SearchRequest(BaseModel):
 class SearchResultResponse(BaseModel):
     """Response model for a search result."""
 
+    model_config = ConfigDict(frozen=True)
+
     runbook: RunbookResponse
     score: float
     match_type: str
@@ -85,67 +111,108 @@ class SearchResultResponse(BaseModel):
 class KnowledgeBaseStatus(BaseModel):
     """Status of the knowledge base."""
 
+    model_config = ConfigDict(frozen=True)
+
     runbook_count: int
     chromadb_available: bool
     embeddings_available: bool
     semantic_search_enabled: bool
 
 
+_RUNBOOK_FIELDS = tuple(RunbookResponse.model_fields)
+
+
 def runbook_to_response(runbook: RunbookEntry) -> RunbookResponse:
-    """Convert a RunbookEntry to a response model."""
-    return RunbookResponse(
-        id=runbook.id,
-        title=runbook.title,
-        alert_patterns=runbook.alert_patterns,
-        content=runbook.content,
-        remediation_steps=runbook.remediation_steps,
-        tags=runbook.tags,
-        severity_hints=runbook.severity_hints,
-        auto_remediate=runbook.auto_remediate,
-        confidence_threshold=runbook.confidence_threshold,
-        metadata=runbook.metadata,
+    """Convert a RunbookEntry to a response model.
+
+    Validation is skipped: knowledge base entries are already trusted.
+    """
+    return RunbookResponse.model_construct(
+        **{name: getattr(runbook, name) for name in _RUNBOOK_FIELDS}
     )
 
 
 def search_result_to_response(result: SearchResult) -> SearchResultResponse:
-    """Convert a SearchResult to a response model."""
-    return SearchResultResponse(
+    """Convert a SearchResult to a response model (without re-validation)."""
+    return SearchResultResponse.model_construct(
         runbook=runbook_to_response(result.runbook),
         score=result.score,
         match_type=result.match_type,
     )
 
 
+async def cached_search(
+    kb: VectorKnowledgeBase,
+    query: str,
+    tags: list[str] | None,
+    top_k: int,
+    use_semantic: bool,
+) -> list[SearchResult]:
+    """Search the knowledge base, serving repeated and near-duplicate queries from cache."""
+    generation = kb.generation
+    key = SearchCache.make_key(query, tags, top_k, use_semantic)
+
+    results = _search_cache.get(key, generation)
+    if results is not None:
+        return results
+
+    query_embedding = None
+    batcher = get_embedding_batcher() if use_semantic else None
+    if batcher is not None:
+        try:
+            query_embedding = await batcher.submit(query)
+        except Exception as e:
+            logger.error("Failed to embed search query", error=str(e))
+
+    if query_embedding is not None:
+        results = _search_cache.get_similar(key, query_embedding, generation)
+        if results is not None:
+            _search_cache.put(key, results, generation)
+            return results
+
+    search = partial(
+        kb.search,
+        query=query,
+        tags=tags,
+        top_k=top_k,
+        use_semantic=use_semantic,
+        query_embedding=query_embedding,
+    )
+    if use_semantic and kb.semantic_search_enabled:
+        # The vector store query blocks; keep it off the event loop
+        results = await run_in_threadpool(search)
+    else:
+        results = search()
+    _search_cache.put(key, results, generation, embedding=query_embedding)
+    return results
+
+
 @router.get("/status", response_model=KnowledgeBaseStatus)
-async def get_status() -> KnowledgeBaseStatus:
+async def get_status(kb: VectorKnowledgeBase = Depends(knowledge_base)) -> KnowledgeBaseStatus:
     """Get knowledge base status."""
-    kb = get_knowledge_base()
     return KnowledgeBaseStatus(
         runbook_count=len(kb.list_runbooks()),
         chromadb_available=CHROMADB_AVAILABLE,
         embeddings_available=EMBEDDINGS_AVAILABLE,
-        semantic_search_enabled=kb._collection is not None and kb._embedder is not None,
+        semantic_search_enabled=kb.semantic_search_enabled,
     )
 
 
 @router.get("/runbooks", response_model=list[RunbookResponse])
 async def list_runbooks(
     tag: str | None = Query(None, description="Filter by tag"),
+    kb: VectorKnowledgeBase = Depends(knowledge_base),
 ) -> list[RunbookResponse]:
     """List all runbooks in the knowledge base."""
-    kb = get_knowledge_base()
-    runbooks = kb.list_runbooks()
-
-    if tag:
-        runbooks = [rb for rb in runbooks if tag.lower() in [t.lower() for t in rb.tags]]
-
+    runbooks = kb.list_runbooks(tag=tag or None)
     return [runbook_to_response(rb) for rb in runbooks]
 
 
 @router.get("/runbooks/{runbook_id}", response_model=RunbookResponse)
-async def get_runbook(runbook_id: str) -> RunbookResponse:
+async def get_runbook(
+    runbook_id: str, kb: VectorKnowledgeBase = Depends(knowledge_base)
+) -> RunbookResponse:
     """Get a specific runbook by ID."""
-    kb = get_knowledge_base()
     runbook = kb.get_runbook(runbook_id)
 
     if not runbook:
@@ -155,9 +222,10 @@ async def get_runbook(runbook_id: str) -> RunbookResponse:
 
 
 @router.post("/runbooks", response_model=RunbookResponse, status_code=201)
-async def create_runbook(runbook: RunbookCreate) -> RunbookResponse:
+async def create_runbook(
+    runbook: RunbookCreate, kb: VectorKnowledgeBase = Depends(knowledge_base)
+) -> RunbookResponse:
     """Create a new runbook."""
-    kb = get_knowledge_base()
 
     # Check if runbook already exists
     if kb.get_runbook(runbook.id):
@@ -184,9 +252,12 @@ async def create_runbook(runbook: RunbookCreate) -> RunbookResponse:
 
 
 @router.put("/runbooks/{runbook_id}", response_model=RunbookResponse)
-async def update_runbook(runbook_id: str, runbook: RunbookCreate) -> RunbookResponse:
+async def update_runbook(
+    runbook_id: str,
+    runbook: RunbookCreate,
+    kb: VectorKnowledgeBase = Depends(knowledge_base),
+) -> RunbookResponse:
     """Update an existing runbook."""
-    kb = get_knowledge_base()
 
     # Check if runbook exists
     if not kb.get_runbook(runbook_id):
@@ -214,9 +285,10 @@ async def update_runbook(runbook_id: str, runbook: RunbookCreate) -> RunbookResp
 
 
 @router.delete("/runbooks/{runbook_id}", status_code=204)
-async def delete_runbook(runbook_id: str) -> None:
+async def delete_runbook(
+    runbook_id: str, kb: VectorKnowledgeBase = Depends(knowledge_base)
+) -> None:
     """Delete a runbook."""
-    kb = get_knowledge_base()
 
     if not kb.remove_runbook(runbook_id):
         raise HTTPException(status_code=404, detail="Runbook not found")
@@ -225,10 +297,12 @@ async def delete_runbook(runbook_id: str) -> None:
 
 
 @router.post("/search", response_model=list[SearchResultResponse])
-async def search_runbooks(request: SearchRequest) -> list[SearchResultResponse]:
+async def search_runbooks(
+    request: SearchRequest, kb: VectorKnowledgeBase = Depends(knowledge_base)
+) -> list[SearchResultResponse]:
     """Search runbooks using semantic and pattern matching."""
-    kb = get_knowledge_base()
-    results = kb.search(
+    results = await cached_search(
+        kb,
         query=request.query,
         tags=request.tags,
         top_k=request.top_k,
@@ -243,11 +317,12 @@ async def search_runbooks_get(
     tags: str | None = Query(None, description="Comma-separated tags to filter by"),
     top_k: int = Query(5, ge=1, le=20, description="Number of results"),
     semantic: bool = Query(True, description="Use semantic search"),
+    kb: VectorKnowledgeBase = Depends(knowledge_base),
 ) -> list[SearchResultResponse]:
     """Search runbooks (GET method for convenience)."""
-    kb = get_knowledge_base()
     tag_list = [t.strip() for t in tags.split(",")] if tags else None
-    results = kb.search(
+    results = await cached_search(
+        kb,
         query=q,
         tags=tag_list,
         top_k=top_k,
@@ -257,63 +332,74 @@ async def search_runbooks_get(
 
 
 @router.get("/tags", response_model=list[str])
-async def list_tags() -> list[str]:
+async def list_tags(kb: VectorKnowledgeBase = Depends(knowledge_base)) -> list[str]:
     """List all unique tags in the knowledge base."""
-    kb = get_knowledge_base()
-    tags: set[str] = set()
-    for runbook in kb.list_runbooks():
-        tags.update(runbook.tags)
-    return sorted(tags)
+    return kb.list_tags()
+
+
+def _parse_runbooks(content: bytes) -> tuple[list[RunbookEntry], int]:
+    """Parse an import document into runbooks, counting invalid entries.
+
+    Raises ValueError if the document is not JSON or has no runbook list.
+    """
+    data = orjson.loads(content)
+    items = data.get("runbooks", []) if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError("expected a list of runbooks")
+
+    runbooks: list[RunbookEntry] = []
+    errors = 0
+    for item in items:
+        try:
+            runbooks.append(RunbookEntry(**RunbookImport.model_validate(item).model_dump()))
+        except ValidationError as e:
+            item_id = item.get("id", "unknown") if isinstance(item, dict) else "unknown"
+            logger.error("Failed to import runbook", error=str(e), item=item_id)
+            errors += 1
+    return runbooks, errors
 
 
 @router.post("/import", response_model=dict[str, int])
-async def import_runbooks(file: UploadFile = File(...)) -> dict[str, int]:
+async def import_runbooks(
+    file: UploadFile = File(...),
+    kb: VectorKnowledgeBase = Depends(knowledge_base),
+) -> dict[str, int]:
     """Import runbooks from a JSON file."""
-    import json
-
     if not file.filename or not file.filename.endswith(".json"):
         raise HTTPException(status_code=400, detail="File must be a JSON file")
 
+    content = await file.read()
     try:
-        content = await file.read()
-        data = json.loads(content)
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        # Parsing large uploads would otherwise stall the event loop
+        runbooks, errors = await asyncio.to_thread(_parse_runbooks, content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid import file: {e}")
 
-    kb = get_knowledge_base()
-    count = 0
-    errors = 0
-
-    runbooks = data if isinstance(data, list) else data.get("runbooks", [])
-    for item in runbooks:
-        try:
-            runbook = RunbookEntry(
-                id=item["id"],
-                title=item["title"],
-                alert_patterns=item.get("alert_patterns", []),
-                content=item.get("content", ""),
-                remediation_steps=item.get("remediation_steps", []),
-                tags=item.get("tags", []),
-                severity_hints=item.get("severity_hints", []),
-                auto_remediate=item.get("auto_remediate", False),
-                confidence_threshold=item.get("confidence_threshold", 0.7),
-                metadata=item.get("metadata", {}),
-            )
-            kb.add_runbook(runbook)
-            count += 1
-        except Exception as e:
-            logger.error("Failed to import runbook", error=str(e), item=item.get("id", "unknown"))
-            errors += 1
+    # Embedding and indexing a large import is seconds of CPU; keep it off the loop too
+    count = await asyncio.to_thread(kb.add_runbooks_bulk, runbooks)
 
     logger.info("Runbooks imported via API", count=count, errors=errors)
     return {"imported": count, "errors": errors}
 
 
-@router.get("/export")
-async def export_runbooks() -> dict[str, Any]:
-    """Export all runbooks as JSON."""
-    from dataclasses import asdict
+def _export_chunks(runbooks: list[RunbookEntry]) -> Iterator[bytes]:
+    """Serialize runbooks one at a time as an export document."""
+    yield b'{"runbooks":['
+    for i, runbook in enumerate(runbooks):
+        chunk = orjson.dumps(runbook.to_dict())
+        yield b"," + chunk if i else chunk
+    yield b'],"count":%d}' % len(runbooks)
 
-    kb = get_knowledge_base()
-    runbooks = [asdict(rb) for rb in kb.list_runbooks()]
-    return {"runbooks": runbooks, "count": len(runbooks)}
+
+@router.get("/export")
+async def export_runbooks(
+    kb: VectorKnowledgeBase = Depends(knowledge_base),
+) -> StreamingResponse:
+    """Export all runbooks as JSON.
+
+    The document is streamed so the full serialized export is never held in memory.
+    """
+    return StreamingResponse(
+        _export_chunks(kb.list_runbooks()),
+        media_type="application/json",
+    )
@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    # Development mode (e.g. reload dashboard templates on change)
+    debug: bool = False
 
     # Database
     database_url: str = "postgresql+asyncpg://localhost:5432/noc_ai"
@@ -27,6 +29,21 @@ class Settings(BaseSettings):
     claude_model: str = "claude-sonnet-4-20250514"
     claude_max_tokens: int = 4096
 
+    # Knowledge base embeddings
+    embedding_model: str = "all-MiniLM-L6-v2"
+    # "torch" or "onnx" (ONNX Runtime with an INT8-quantized model)
+    embedding_backend: str = "torch"
+    embedding_onnx_file: str = "onnx/model_qint8_avx512_vnni.onnx"
+
+    # Slack approvals and notifications
+    slack_token: str | None = None
+    slack_approval_channel: str = "#noc-alerts"
+    slack_enabled: bool = True
+    approval_timeout_minutes: int = 30
+
+    # Threads for blocking Kubernetes, SSH and SNMP client calls
+    blocking_io_workers: int = 32
+
     # Kubernetes
     kubeconfig_path: str | None = None
     k8s_namespace: str = "default"
@@ -46,3 +63,10 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+# Settings read on every alert or action, bound once as module constants
+API_HOST = settings.api_host
+API_PORT = settings.api_port
+CLAUDE_MODEL = settings.claude_model
+CLAUDE_MAX_TOKENS = settings.claude_max_tokens
+K8S_NAMESPACE = settings.k8s_namespace
@@ -1,18 +1,34 @@
 """Event processor - orchestrates the alert processing pipeline."""
 
 import asyncio
+import time
+from collections import Counter, OrderedDict
 from collections.abc import Callable
 from datetime import datetime
-from typing import Any
-from uuid import uuid4
+from functools import partial
+from hashlib import blake2b
+from itertools import islice
+from typing import Any, NamedTuple
 
 import structlog
 
 from src.ai.llm.analyzer import AlertAnalyzer
+from src.core.ids import new_id
 from src.core.models import ActionStatus, ActionType, AIAnalysis, Event, RemediationAction
 
 logger = structlog.get_logger()
 
+
+class ProcessorStats(NamedTuple):
+    """Point-in-time event and action counts."""
+
+    total_events: int
+    total_actions: int
+    pending_actions: int
+    successful_actions: int
+    failed_actions: int
+
+
 # Global event processor instance
 _processor: "EventProcessor | None" = None
 
@@ -26,17 +42,49 @@ def get_event_processor() -> "EventProcessor":
 
 
 class EventProcessor:
-    """Processes incoming events through the AI pipeline."""
-
-    def __init__(self) -> None:
+    """Processes incoming events through the AI pipeline.
+
+    Events and actions are kept in bounded, insertion-ordered stores; once
+    full, the oldest entries are evicted along with their analyses and
+    actions. Queued events are each processed in their own task as soon as
+    one of the ``max_concurrency`` processing slots is free, so a slow
+    analysis never holds up the events queued behind it.
+
+    Analyses are cached by alert fingerprint (source, severity, title and
+    labels) for ``analysis_cache_ttl`` seconds, so repeated alerts reuse the
+    previous analysis; once a knowledge base is set, a change to it also
+    invalidates cached analyses.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 10_000,
+        max_actions: int = 50_000,
+        max_concurrency: int = 16,
+        analysis_cache_size: int = 5000,
+        analysis_cache_ttl: float = 600.0,
+    ) -> None:
         self.analyzer = AlertAnalyzer()
         self.action_handlers: dict[str, Callable] = {}
+        self.max_events = max_events
+        self.max_actions = max_actions
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._event_tasks: set[asyncio.Task[None]] = set()
+        self.analysis_cache_size = analysis_cache_size
+        self.analysis_cache_ttl = analysis_cache_ttl
+        # fingerprint -> (analysis, expiry monotonic time, knowledge base generation)
+        self._analysis_cache: OrderedDict[str, tuple[AIAnalysis, float, int]] = OrderedDict()
+        self._inflight_analyses: dict[str, asyncio.Future[AIAnalysis]] = {}
         self._running = False
+        self._task: asyncio.Task | None = None
         self._queue: asyncio.Queue[Event] = asyncio.Queue()
-        self._events: dict[str, Event] = {}
-        self._actions: dict[str, RemediationAction] = {}
+        self._events: OrderedDict[str, Event] = OrderedDict()
+        self._actions: OrderedDict[str, RemediationAction] = OrderedDict()
         self._analyses: dict[str, AIAnalysis] = {}
+        self._actions_by_event: dict[str, list[str]] = {}
+        self._status_counts: Counter[ActionStatus] = Counter()
         self._approval_service: Any = None
+        self._knowledge_base: Any = None
 
     def set_approval_service(self, service: Any) -> None:
         """Set the approval service for workflow integration."""
@@ -48,24 +96,37 @@ class EventProcessor:
 
         logger.info("Approval service connected to event processor")
 
+    def set_knowledge_base(self, knowledge_base: Any) -> None:
+        """Set the knowledge base whose generation invalidates cached analyses."""
+        self._knowledge_base = knowledge_base
+        self._analysis_cache.clear()
+
     async def _on_action_approved(self, request: Any) -> None:
         """Callback when an action is approved via the approval workflow."""
-        action = request.action
-        if action.id in self._actions:
-            self._actions[action.id].status = ActionStatus.APPROVED
-            await self._execute_action(self._actions[action.id])
+        action = self._actions.get(request.action.id)
+        if action:
+            self._set_status(action, ActionStatus.APPROVED)
+            await self._execute_action(action)
 
     async def _on_action_rejected(self, request: Any) -> None:
         """Callback when an action is rejected via the approval workflow."""
-        action = request.action
-        if action.id in self._actions:
-            self._actions[action.id].status = ActionStatus.REJECTED
+        action = self._actions.get(request.action.id)
+        if action:
+            self._set_status(action, ActionStatus.REJECTED)
 
     async def start(self) -> None:
-        """Start the event processor."""
+        """Start the event processor.
+
+        Calling this while the processor is already running is a no-op, so
+        there is never more than one processing loop.
+        """
         self._running = True
+        if self._task is not None and not self._task.done():
+            # Either running, or stopped but not yet exited; the loop picks
+            # the flag back up either way
+            return
+        self._task = asyncio.create_task(self._process_loop())
         logger.info("Event processor started")
-        asyncio.create_task(self._process_loop())
 
     async def stop(self) -> None:
         """Stop the event processor."""
@@ -75,11 +136,11 @@ class EventProcessor:
     async def submit_event(self, event: Event) -> str:
         """Submit an event for processing."""
         if not event.id:
-            event.id = str(uuid4())
+            event.id = new_id()
 
-        self._events[event.id] = event
+        self._store_event(event)
         await self._queue.put(event)
-        logger.info("Event submitted", event_id=event.id, source=event.source)
+        logger.debug("Event submitted", event_id=event.id, source=event.source.value)
         return event.id
 
     def get_event(self, event_id: str) -> Event | None:
@@ -90,6 +151,10 @@ class EventProcessor:
         """Get an action by ID."""
         return self._actions.get(action_id)
 
+    def get_actions_for_event(self, event_id: str) -> list[RemediationAction]:
+        """Get the actions created for an event, in creation order."""
+        return [self._actions[action_id] for action_id in self._actions_by_event.get(event_id, ())]
+
     def get_analysis(self, event_id: str) -> AIAnalysis | None:
         """Get analysis for an event."""
         return self._analyses.get(event_id)
@@ -101,7 +166,7 @@ class EventProcessor:
             return {
                 "summary": analysis.summary,
                 "root_cause": analysis.root_cause,
-                "suggested_actions": [a.value for a in analysis.suggested_actions],
+                "suggested_actions": list(analysis.suggested_action_values),
                 "confidence": analysis.confidence,
                 "reasoning": analysis.reasoning,
                 "requires_approval": analysis.requires_approval,
@@ -111,27 +176,53 @@ class EventProcessor:
         return None
 
     def list_events(self, limit: int = 100) -> list[Event]:
-        """List recent events."""
-        events = list(self._events.values())
-        events.sort(key=lambda e: e.timestamp, reverse=True)
-        return events[:limit]
+        """List recent events, most recently submitted first."""
+        return list(islice(reversed(self._events.values()), limit))
 
     def list_actions(self, limit: int = 100) -> list[RemediationAction]:
-        """List recent actions."""
-        actions = list(self._actions.values())
-        actions.sort(key=lambda a: a.created_at, reverse=True)
-        return actions[:limit]
+        """List recent actions, most recently created first."""
+        return list(islice(reversed(self._actions.values()), limit))
+
+    def list_events_projection(self, limit: int = 100) -> list[dict[str, Any]]:
+        """List recent events as plain rows holding only the fields list views render."""
+        return [
+            {
+                "id": event.id,
+                "title": event.title,
+                "source": event.source.value,
+                "severity": event.severity.value,
+                "timestamp": event.timestamp,
+            }
+            for event in islice(reversed(self._events.values()), limit)
+        ]
+
+    def list_actions_projection(self, limit: int = 100) -> list[dict[str, Any]]:
+        """List recent actions as plain rows holding only the fields list views render."""
+        return [
+            {
+                "id": action.id,
+                "action_type": action.action_type.value,
+                "status": action.status.value,
+                "confidence": action.confidence,
+                "created_at": action.created_at,
+            }
+            for action in islice(reversed(self._actions.values()), limit)
+        ]
+
+    def stats_snapshot(self) -> ProcessorStats:
+        """Get event and action statistics as a single immutable snapshot."""
+        counts = self._status_counts
+        return ProcessorStats(
+            len(self._events),
+            len(self._actions),
+            counts[ActionStatus.PENDING],
+            counts[ActionStatus.SUCCESS],
+            counts[ActionStatus.FAILED],
+        )
 
     def get_stats(self) -> dict[str, int]:
         """Get event and action statistics."""
-        actions = list(self._actions.values())
-        return {
-            "total_events": len(self._events),
-            "total_actions": len(actions),
-            "pending_actions": sum(1 for a in actions if a.status == ActionStatus.PENDING),
-            "successful_actions": sum(1 for a in actions if a.status == ActionStatus.SUCCESS),
-            "failed_actions": sum(1 for a in actions if a.status == ActionStatus.FAILED),
-        }
+        return self.stats_snapshot()._asdict()
 
     def register_handler(self, action_type: ActionType, handler: Callable) -> None:
         """Register an action handler."""
@@ -142,7 +233,7 @@ class EventProcessor:
         """Approve a pending action (legacy - direct approval)."""
         action = self._actions.get(action_id)
         if action and action.status == ActionStatus.PENDING:
-            action.status = ActionStatus.APPROVED
+            self._set_status(action, ActionStatus.APPROVED)
             await self._execute_action(action)
             return True
         return False
@@ -151,51 +242,103 @@ class EventProcessor:
         """Reject a pending action (legacy - direct rejection)."""
         action = self._actions.get(action_id)
         if action and action.status == ActionStatus.PENDING:
-            action.status = ActionStatus.REJECTED
+            self._set_status(action, ActionStatus.REJECTED)
             return True
         return False
 
+    def _store_event(self, event: Event) -> None:
+        """Store an event, evicting the oldest events once over capacity."""
+        self._events[event.id] = event
+        self._events.move_to_end(event.id)
+
+        while len(self._events) > self.max_events:
+            evicted_id, _ = self._events.popitem(last=False)
+            self._analyses.pop(evicted_id, None)
+            for action_id in self._actions_by_event.pop(evicted_id, ()):
+                action = self._actions.pop(action_id, None)
+                if action:
+                    self._status_counts[action.status] -= 1
+
+    def _store_action(self, action: RemediationAction) -> None:
+        """Store an action, evicting the oldest actions once over capacity."""
+        self._actions[action.id] = action
+        self._actions_by_event.setdefault(action.event_id, []).append(action.id)
+        self._status_counts[action.status] += 1
+
+        while len(self._actions) > self.max_actions:
+            _, evicted = self._actions.popitem(last=False)
+            self._status_counts[evicted.status] -= 1
+            event_actions = self._actions_by_event.get(evicted.event_id)
+            if event_actions:
+                event_actions.remove(evicted.id)
+                if not event_actions:
+                    del self._actions_by_event[evicted.event_id]
+
+    def _set_status(self, action: RemediationAction, status: ActionStatus) -> None:
+        """Transition an action to a new status, keeping status counts in sync."""
+        if self._actions.get(action.id) is action:
+            self._status_counts[action.status] -= 1
+            self._status_counts[status] += 1
+        action.status = status
+
     async def _process_loop(self) -> None:
-        """Main processing loop."""
+        """Main processing loop, dispatching each event once a slot is free."""
         while self._running:
+            # Take a slot before dequeuing so events wait in the queue, not in tasks
+            await self._semaphore.acquire()
             try:
                 event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                await self._process_event(event)
-            except TimeoutError:
-                continue
-            except Exception as e:
-                logger.error("Error in processing loop", error=str(e))
+            except BaseException as e:
+                self._semaphore.release()
+                if isinstance(e, TimeoutError):
+                    continue
+                raise
+
+            task = asyncio.create_task(self._process_event(event))
+            self._event_tasks.add(task)
+            task.add_done_callback(partial(self._on_event_processed, event.id))
+
+    def _on_event_processed(self, event_id: str, task: asyncio.Task[None]) -> None:
+        """Free the task's processing slot and log how it failed, if it did."""
+        self._semaphore.release()
+        self._event_tasks.discard(task)
+        if task.cancelled():
+            logger.warning("Event processing cancelled", event_id=event_id)
+        elif (error := task.exception()) is not None:
+            logger.error("Error in processing loop", event_id=event_id, error=str(error))
 
     async def _process_event(self, event: Event) -> None:
         """Process a single event."""
-        logger.info("Processing event", event_id=event.id, title=event.title)
+        log = logger.bind(event_id=event.id, source=event.source.value)
+        log.info("Processing event", title=event.title)
 
         # Analyze with AI
-        analysis = await self.analyzer.analyze(event)
+        analysis = await self._analyze(event)
 
         # Store analysis
         self._analyses[event.id] = analysis
 
-        logger.info(
+        log.info(
             "AI analysis complete",
-            event_id=event.id,
             confidence=analysis.confidence,
-            actions=[a.value for a in analysis.suggested_actions],
+            actions=analysis.suggested_action_values,
             requires_approval=analysis.requires_approval,
             runbook_id=analysis.runbook_id,
         )
 
         # Create remediation actions
+        created_at = datetime.utcnow()
         for action_type in analysis.suggested_actions:
             action = RemediationAction(
-                id=str(uuid4()),
+                id=new_id(),
                 event_id=event.id,
                 action_type=action_type,
                 confidence=analysis.confidence,
                 status=ActionStatus.PENDING,  # Always start as pending
+                created_at=created_at,
             )
 
-            self._actions[action.id] = action
+            self._store_action(action)
 
             # Route through approval workflow if available
             if self._approval_service:
@@ -206,35 +349,96 @@ class EventProcessor:
                 )
             elif not analysis.requires_approval:
                 # No approval service and approval not required
-                action.status = ActionStatus.APPROVED
+                self._set_status(action, ActionStatus.APPROVED)
                 await self._execute_action(action)
             else:
-                logger.info(
+                log.info(
                     "Action requires approval (no approval service)",
                     action_id=action.id,
                     action_type=action_type.value,
                 )
 
+    @staticmethod
+    def _fingerprint(event: Event) -> str:
+        """Fingerprint an alert for analysis caching."""
+        key = f"{event.source.value}|{event.severity.value}|{event.title}|{sorted(event.labels.items())}"
+        return blake2b(key.encode(), digest_size=16).hexdigest()
+
+    async def _analyze(self, event: Event) -> AIAnalysis:
+        """Analyze an event, reusing the cached analysis of an identical alert."""
+        fingerprint = self._fingerprint(event)
+        kb_generation = (
+            self._knowledge_base.generation if self._knowledge_base is not None else 0
+        )
+
+        cached = self._analysis_cache.get(fingerprint)
+        if cached:
+            analysis, expires_at, generation = cached
+            if expires_at > time.monotonic() and generation == kb_generation:
+                self._analysis_cache.move_to_end(fingerprint)
+                logger.debug("Using cached analysis", event_id=event.id, fingerprint=fingerprint)
+                return self._copy_analysis(analysis, event)
+            del self._analysis_cache[fingerprint]
+
+        # Identical alerts arriving together share a single analyzer call
+        inflight = self._inflight_analyses.get(fingerprint)
+        if inflight:
+            return self._copy_analysis(await asyncio.shield(inflight), event)
+
+        future: asyncio.Future[AIAnalysis] = asyncio.get_running_loop().create_future()
+        self._inflight_analyses[fingerprint] = future
+        try:
+            analysis = await self.analyzer.analyze(event)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when no other event is waiting
+            raise
+        except BaseException:
+            # Leader was cancelled; release followers instead of leaving them waiting
+            future.cancel()
+            raise
+        finally:
+            del self._inflight_analyses[fingerprint]
+        future.set_result(analysis)
+
+        # Fallback analyses (analyzer errors) report zero confidence; don't cache them
+        if analysis.confidence > 0:
+            self._analysis_cache[fingerprint] = (
+                analysis,
+                time.monotonic() + self.analysis_cache_ttl,
+                kb_generation,
+            )
+            while len(self._analysis_cache) > self.analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+
+        return analysis
+
+    @staticmethod
+    def _copy_analysis(analysis: AIAnalysis, event: Event) -> AIAnalysis:
+        """Copy a cached analysis for another event."""
+        return analysis.model_copy(update={"event_id": event.id, "timestamp": datetime.utcnow()})
+
     async def _execute_action(self, action: RemediationAction) -> None:
         """Execute a remediation action."""
-        logger.info("Executing action", action_id=action.id, action_type=action.action_type.value)
+        log = logger.bind(action_id=action.id, action_type=action.action_type.value)
+        log.info("Executing action")
 
         handler = self.action_handlers.get(action.action_type.value)
         if handler:
             try:
-                action.status = ActionStatus.EXECUTING
+                self._set_status(action, ActionStatus.EXECUTING)
                 action.executed_at = datetime.utcnow()
                 result = await handler(action)
-                action.status = ActionStatus.SUCCESS
+                self._set_status(action, ActionStatus.SUCCESS)
                 action.result = result
-                logger.info("Action completed", action_id=action.id)
+                log.info("Action completed")
             except Exception as e:
-                action.status = ActionStatus.FAILED
+                self._set_status(action, ActionStatus.FAILED)
                 action.error = str(e)
-                logger.error("Action failed", action_id=action.id, error=str(e))
+                log.error("Action failed", error=str(e))
         else:
-            logger.warning("No handler for action type", action_type=action.action_type.value)
+            log.warning("No handler for action type")
             # Mark as success for no_action and escalate types
             if action.action_type in [ActionType.NO_ACTION, ActionType.ESCALATE]:
-                action.status = ActionStatus.SUCCESS
+                self._set_status(action, ActionStatus.SUCCESS)
                 action.result = {"message": f"Action type {action.action_type.value} logged"}
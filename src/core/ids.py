@@ -0,0 +1,38 @@
+"""Identifier generation."""
+
+import os
+import threading
+from uuid import UUID
+
+# Random bytes fetched per os.urandom() call (256 UUIDs)
+_POOL_SIZE = 4096
+
+_lock = threading.Lock()
+_pool = b""
+_offset = _POOL_SIZE
+
+
+def _reset_pool() -> None:
+    """Discard pooled entropy so forked processes never share IDs."""
+    global _pool, _offset
+    _pool = b""
+    _offset = _POOL_SIZE
+
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+def new_id() -> str:
+    """Generate a random UUID4 string.
+
+    Equivalent to ``str(uuid4())``, but draws from a pool of random bytes
+    refilled every 256 IDs instead of making one ``os.urandom`` syscall per ID.
+    """
+    global _pool, _offset
+    with _lock:
+        if _offset >= _POOL_SIZE:
+            _pool = os.urandom(_POOL_SIZE)
+            _offset = 0
+        chunk = _pool[_offset : _offset + 16]
+        _offset += 16
+    return str(UUID(bytes=chunk, version=4))
@@ -2,9 +2,10 @@
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EventSeverity(str, Enum):
@@ -52,6 +53,8 @@ class ActionStatus(str, Enum):
 class Event(BaseModel):
     """Unified event model."""
 
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     id: str = Field(default_factory=lambda: "")
     source: EventSource
     severity: EventSeverity
@@ -65,6 +68,8 @@ class Event(BaseModel):
 class AIAnalysis(BaseModel):
     """AI analysis result."""
 
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     event_id: str
     summary: str
     root_cause: str | None = None
@@ -75,10 +80,17 @@ class AIAnalysis(BaseModel):
     runbook_id: str | None = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+    @cached_property
+    def suggested_action_values(self) -> tuple[str, ...]:
+        """Suggested action types as strings, computed once per analysis."""
+        return tuple(a.value for a in self.suggested_actions)
+
 
 class RemediationAction(BaseModel):
     """Remediation action to execute."""
 
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     id: str = Field(default_factory=lambda: "")
     event_id: str
     action_type: ActionType
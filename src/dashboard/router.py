@@ -1,40 +1,74 @@
 """Dashboard routes for the monitoring UI."""
 
+import asyncio
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Any
 
+import jinja2
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
-from src.core.event_processor import get_event_processor
+from src.core.config import settings
+from src.core.event_processor import ProcessorStats, get_event_processor
 
 router = APIRouter()
 
 # Templates directory
 templates_dir = Path(__file__).parent / "templates"
-templates = Jinja2Templates(directory=str(templates_dir))
+templates = Jinja2Templates(
+    env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader(templates_dir),
+        autoescape=True,
+        # Templates only change on deploy; skip per-render mtime checks
+        auto_reload=settings.debug,
+        cache_size=400,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(),
+    )
+)
+
+
+async def _render(request: Request, name: str, context: dict[str, Any]) -> HTMLResponse:
+    """Render a template on the dashboard thread pool, off the event loop.
+
+    Falls back to the loop's default executor when the lifespan has not run.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        getattr(request.app.state, "dashboard_executor", None),
+        partial(templates.TemplateResponse, request, name, context),
+    )
+
+
+_templates_warm = False
+
+
+def warm_templates() -> None:
+    """Compile every dashboard template so first requests skip compilation.
+
+    Safe to call more than once; templates are only compiled the first time.
+    """
+    global _templates_warm
+    if _templates_warm:
+        return
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+    _templates_warm = True
 
 
 @router.get("/", response_class=HTMLResponse)
 async def dashboard_home(request: Request):
     """Main dashboard page."""
     processor = get_event_processor()
-    events = processor.list_events(limit=50)
-    actions = processor.list_actions(limit=50)
-
-    # Calculate stats
-    stats = {
-        "total_events": len(processor._events),
-        "total_actions": len(processor._actions),
-        "pending_actions": sum(1 for a in processor._actions.values() if a.status.value == "pending"),
-        "successful_actions": sum(1 for a in processor._actions.values() if a.status.value == "success"),
-        "failed_actions": sum(1 for a in processor._actions.values() if a.status.value == "failed"),
-    }
-
-    return templates.TemplateResponse(
+    events = processor.list_events_projection(limit=50)
+    actions = processor.list_actions_projection(limit=50)
+
+    stats = processor.stats_snapshot()
+
+    return await _render(
+        request,
         "dashboard.html",
         {
-            "request": request,
             "events": events,
             "actions": actions,
             "stats": stats,
@@ -46,11 +80,12 @@ async def dashboard_home(request: Request):
 async def events_list(request: Request):
     """Events list partial (for HTMX updates)."""
     processor = get_event_processor()
-    events = processor.list_events(limit=50)
+    events = processor.list_events_projection(limit=50)
 
-    return templates.TemplateResponse(
+    return await _render(
+        request,
         "partials/events_list.html",
-        {"request": request, "events": events},
+        {"events": events},
     )
 
 
@@ -61,13 +96,12 @@ async def event_detail(request: Request, event_id: str):
     event = processor.get_event(event_id)
     analysis = processor.get_analysis(event_id)
 
-    # Get related actions
-    related_actions = [a for a in processor._actions.values() if a.event_id == event_id]
+    related_actions = processor.get_actions_for_event(event_id)
 
-    return templates.TemplateResponse(
+    return await _render(
+        request,
         "event_detail.html",
         {
-            "request": request,
             "event": event,
             "analysis": analysis,
             "actions": related_actions,
@@ -79,11 +113,12 @@ async def event_detail(request: Request, event_id: str):
 async def actions_list(request: Request):
     """Actions list partial (for HTMX updates)."""
     processor = get_event_processor()
-    actions = processor.list_actions(limit=50)
+    actions = processor.list_actions_projection(limit=50)
 
-    return templates.TemplateResponse(
+    return await _render(
+        request,
         "partials/actions_list.html",
-        {"request": request, "actions": actions},
+        {"actions": actions},
     )
 
 
@@ -94,10 +129,10 @@ async def action_detail(request: Request, action_id: str):
     action = processor.get_action(action_id)
     event = processor.get_event(action.event_id) if action else None
 
-    return templates.TemplateResponse(
+    return await _render(
+        request,
         "action_detail.html",
         {
-            "request": request,
             "action": action,
             "event": event,
         },
@@ -108,16 +143,10 @@ async def action_detail(request: Request, action_id: str):
 async def stats_partial(request: Request):
     """Stats partial (for HTMX updates)."""
     processor = get_event_processor()
+    return HTMLResponse(_render_stats(processor.stats_snapshot()))
 
-    stats = {
-        "total_events": len(processor._events),
-        "total_actions": len(processor._actions),
-        "pending_actions": sum(1 for a in processor._actions.values() if a.status.value == "pending"),
-        "successful_actions": sum(1 for a in processor._actions.values() if a.status.value == "success"),
-        "failed_actions": sum(1 for a in processor._actions.values() if a.status.value == "failed"),
-    }
-
-    return templates.TemplateResponse(
-        "partials/stats.html",
-        {"request": request, "stats": stats},
-    )
+
+@lru_cache(maxsize=64)
+def _render_stats(stats: ProcessorStats) -> str:
+    """Render the stats partial, reusing the HTML while the counts are unchanged."""
+    return templates.get_template("partials/stats.html").render(stats=stats)
@@ -1,22 +1,37 @@
 """Main entry point for NOC AI Operator."""
 
-import asyncio
 import sys
+from typing import Any
 
+import orjson
 import structlog
 import uvicorn
 
 from src.actions.kubernetes.executor import K8sExecutor
 from src.adapters.ssh.executor import SSHActionHandler
 from src.api.app import create_app
-from src.core.config import settings
+from src.core.config import API_HOST, API_PORT, settings
 from src.core.event_processor import get_event_processor
 from src.core.models import ActionType
 
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize a log event with orjson for the JSON renderer.
+
+    Non-string dict keys are allowed so that bound values such as label or
+    count mappings encode the way the stdlib ``json`` renderer did.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode()
+
+
+JSON_LOGS = settings.log_format == "json"
+
+
 # Configure structured logging
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
+        structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
@@ -24,8 +39,8 @@ structlog.configure(
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
         (
-            structlog.processors.JSONRenderer()
-            if settings.log_format == "json"
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+            if JSON_LOGS
             else structlog.dev.ConsoleRenderer()
         ),
     ],
@@ -38,7 +53,7 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
-async def register_action_handlers() -> None:
+def register_action_handlers() -> None:
     """Register all action handlers with the event processor."""
     processor = get_event_processor()
 
@@ -55,64 +70,37 @@ async def register_action_handlers() -> None:
     logger.info("Action handlers registered")
 
 
-async def start_services() -> None:
-    """Start all background services."""
-    # Start event processor
-    processor = get_event_processor()
-    await processor.start()
-
-    # Register action handlers
-    await register_action_handlers()
-
-    # Start syslog receiver if enabled
-    # Note: Requires root/elevated privileges for port 514
-    # syslog_receiver = SyslogReceiver()
-    # await syslog_receiver.start()
-
-    logger.info("All services started")
-
-
-async def shutdown_services() -> None:
-    """Shutdown all services gracefully."""
-    processor = get_event_processor()
-    await processor.stop()
-    logger.info("All services stopped")
-
-
 def main() -> None:
-    """Main entry point."""
+    """Main entry point.
+
+    Services (event processor, approval workflow) are started and stopped by
+    the application lifespan; uvicorn owns the event loop and uses uvloop and
+    httptools when they are installed.
+    """
     logger.info(
         "Starting NOC AI Operator",
         version="0.1.0",
-        api_port=settings.api_port,
+        api_port=API_PORT,
         log_level=settings.log_level,
     )
 
-    app = create_app()
-
-    config = uvicorn.Config(
-        app,
-        host=settings.api_host,
-        port=settings.api_port,
-        log_level=settings.log_level.lower(),
-    )
-    server = uvicorn.Server(config)
+    # Handlers must be in place before the lifespan starts the event processor
+    register_action_handlers()
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # Syslog receiver is not started here: it requires root/elevated
+    # privileges for port 514
 
     try:
-        loop.run_until_complete(start_services())
-        loop.run_until_complete(server.serve())
-    except KeyboardInterrupt:
-        logger.info("Shutdown requested...")
+        uvicorn.run(
+            create_app(),
+            host=API_HOST,
+            port=API_PORT,
+            log_level=settings.log_level.lower(),
+        )
     except Exception as e:
         logger.error("Fatal error", error=str(e))
         sys.exit(1)
-    finally:
-        loop.run_until_complete(shutdown_services())
-        loop.close()
-        logger.info("NOC AI Operator stopped")
+    logger.info("NOC AI Operator stopped")
 
 
 if __name__ == "__main__":
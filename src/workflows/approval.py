@@ -1,6 +1,7 @@
 """Approval workflow service for remediation actions."""
 
 import asyncio
+import heapq
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -9,9 +10,10 @@ from typing import Any
 from uuid import uuid4
 
 import structlog
+from structlog.contextvars import bound_contextvars
 
 from src.core.config import settings
-from src.core.models import ActionType, AIAnalysis, Event, RemediationAction
+from src.core.models import ActionType, AIAnalysis, Event, EventSeverity, RemediationAction
 
 logger = structlog.get_logger()
 
@@ -37,20 +39,24 @@ class ApprovalConfig:
     auto_approve_severity: str = "info"
 
     # Action types that always require approval
-    always_require_approval: list[ActionType] = field(
-        default_factory=lambda: [
-            ActionType.K8S_ROLLBACK,
-            ActionType.SSH_COMMAND,
-        ]
+    always_require_approval: frozenset[ActionType] = field(
+        default_factory=lambda: frozenset(
+            {
+                ActionType.K8S_ROLLBACK,
+                ActionType.SSH_COMMAND,
+            }
+        )
     )
 
     # Action types that can be auto-approved with high confidence
-    auto_approvable: list[ActionType] = field(
-        default_factory=lambda: [
-            ActionType.K8S_RESTART_POD,
-            ActionType.K8S_SCALE_DEPLOYMENT,
-            ActionType.NO_ACTION,
-        ]
+    auto_approvable: frozenset[ActionType] = field(
+        default_factory=lambda: frozenset(
+            {
+                ActionType.K8S_RESTART_POD,
+                ActionType.K8S_SCALE_DEPLOYMENT,
+                ActionType.NO_ACTION,
+            }
+        )
     )
 
     # Minimum confidence for auto-approval
@@ -76,13 +82,20 @@ class ApprovalRequest:
     status: ApprovalStatus = ApprovalStatus.PENDING
     created_at: datetime = field(default_factory=datetime.utcnow)
     expires_at: datetime | None = None
+    # Event loop clock deadline used for expiry scheduling
+    expires_at_mono: float = 0.0
     approved_by: str | None = None
     rejected_by: str | None = None
     rejection_reason: str | None = None
     slack_message_ts: str | None = None
+    # Resolves to slack_message_ts once the queued Slack post has been sent
+    slack_message: asyncio.Future[str | None] | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+ApprovalCallback = Callable[[ApprovalRequest], Awaitable[None]]
+
+
 @dataclass
 class ApprovalResponse:
     """Response from an approval decision."""
@@ -105,25 +118,31 @@ class ApprovalService:
         self.config = config or ApprovalConfig()
         self._notifier = notifier
         self._pending_requests: dict[str, ApprovalRequest] = {}
-        self._approval_callbacks: list[Callable[[ApprovalRequest], Awaitable[None]]] = []
-        self._rejection_callbacks: list[Callable[[ApprovalRequest], Awaitable[None]]] = []
+        # Tuples so dispatch iterates an immutable snapshot; fixed once started
+        self._approval_callbacks: tuple[ApprovalCallback, ...] = ()
+        self._rejection_callbacks: tuple[ApprovalCallback, ...] = ()
         self._expiry_task: asyncio.Task | None = None
+        # (expires_at_mono, request_id) min-heap; entries for decided requests are skipped lazily
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._expiry_wakeup = asyncio.Event()
 
     def set_notifier(self, notifier: Any) -> None:
         """Set the notification handler (e.g., Slack)."""
         self._notifier = notifier
 
-    def on_approval(
-        self, callback: Callable[[ApprovalRequest], Awaitable[None]]
-    ) -> None:
+    def on_approval(self, callback: ApprovalCallback) -> None:
         """Register a callback for when an action is approved."""
-        self._approval_callbacks.append(callback)
+        self._check_not_started()
+        self._approval_callbacks += (callback,)
 
-    def on_rejection(
-        self, callback: Callable[[ApprovalRequest], Awaitable[None]]
-    ) -> None:
+    def on_rejection(self, callback: ApprovalCallback) -> None:
         """Register a callback for when an action is rejected."""
-        self._rejection_callbacks.append(callback)
+        self._check_not_started()
+        self._rejection_callbacks += (callback,)
+
+    def _check_not_started(self) -> None:
+        if self._expiry_task is not None:
+            raise RuntimeError("Callbacks must be registered before the approval service starts")
 
     async def start(self) -> None:
         """Start the approval service (expiry checker)."""
@@ -138,6 +157,7 @@ class ApprovalService:
                 await self._expiry_task
             except asyncio.CancelledError:
                 pass
+            self._expiry_task = None
         logger.info("Approval service stopped")
 
     async def request_approval(
@@ -150,49 +170,50 @@ class ApprovalService:
         # Check if auto-approval is possible
         auto_approve, reason = self._check_auto_approve(action, event, analysis)
 
+        now = datetime.utcnow()
+        timeout_seconds = self.config.timeout_minutes * 60
         request = ApprovalRequest(
             id=str(uuid4()),
             action=action,
             event=event,
             analysis=analysis,
             status=ApprovalStatus.AUTO_APPROVED if auto_approve else ApprovalStatus.PENDING,
-            expires_at=datetime.utcnow() + timedelta(minutes=self.config.timeout_minutes),
+            created_at=now,
+            expires_at=now + timedelta(seconds=timeout_seconds),
+            expires_at_mono=asyncio.get_running_loop().time() + timeout_seconds,
         )
 
-        if auto_approve:
-            logger.info(
-                "Action auto-approved",
-                request_id=request.id,
-                action_type=action.action_type.value,
-                reason=reason,
-            )
-            request.approved_by = "system"
-            request.metadata["auto_approve_reason"] = reason
-
-            # Trigger approval callbacks
-            for callback in self._approval_callbacks:
-                try:
-                    await callback(request)
-                except Exception as e:
-                    logger.error("Approval callback error", error=str(e))
-        else:
-            # Store pending request
-            self._pending_requests[request.id] = request
-
-            # Send notification
-            if self._notifier:
-                try:
-                    message_ts = await self._notifier.send_approval_request(request)
-                    request.slack_message_ts = message_ts
-                except Exception as e:
-                    logger.error("Failed to send approval notification", error=str(e))
-
-            logger.info(
-                "Approval requested",
-                request_id=request.id,
-                action_type=action.action_type.value,
-                expires_at=request.expires_at.isoformat() if request.expires_at else None,
-            )
+        with bound_contextvars(request_id=request.id, action_type=action.action_type.value):
+            if auto_approve:
+                logger.info("Action auto-approved", reason=reason)
+                request.approved_by = "system"
+                request.metadata["auto_approve_reason"] = reason
+
+                # Trigger approval callbacks
+                await self._dispatch(request, self._approval_callbacks, "Approval callback error")
+            else:
+                # Store pending request
+                self._pending_requests[request.id] = request
+                heapq.heappush(self._expiry_heap, (request.expires_at_mono, request.id))
+                if self._expiry_heap[0][1] == request.id:
+                    # New earliest deadline; reschedule the expiry loop
+                    self._expiry_wakeup.set()
+
+                # Send notification
+                if self._notifier:
+                    try:
+                        # Only queues the post; status updates are chained on its timestamp
+                        request.slack_message = await self._notifier.send_approval_request(
+                            request
+                        )
+                    except Exception:
+                        logger.exception("Failed to send approval notification")
+
+                logger.info(
+                    "Approval requested",
+                    # Rendered by the log formatter, so filtered-out lines never format it
+                    expires_at=request.expires_at,
+                )
 
         return request
 
@@ -202,19 +223,14 @@ class ApprovalService:
         event: Event,
         analysis: AIAnalysis,
     ) -> tuple[bool, str]:
-        """Check if an action can be auto-approved."""
-        # Never auto-approve certain action types
-        if action.action_type in self.config.always_require_approval:
-            return False, f"Action type {action.action_type.value} always requires approval"
+        """Check if an action can be auto-approved.
 
+        Disqualifying checks run cheapest first; any of them denies approval.
+        """
         # Check if analysis says approval is required
         if analysis.requires_approval:
             return False, "AI analysis recommends manual approval"
 
-        # Check if action type is auto-approvable
-        if action.action_type not in self.config.auto_approvable:
-            return False, f"Action type {action.action_type.value} is not auto-approvable"
-
         # Check confidence threshold
         if analysis.confidence < self.config.auto_approve_confidence:
             return (
@@ -222,13 +238,23 @@ class ApprovalService:
                 f"Confidence {analysis.confidence:.2f} below threshold {self.config.auto_approve_confidence}",
             )
 
+        # Never auto-approve certain action types
+        action_type = action.action_type
+        if action_type in self.config.always_require_approval:
+            return False, f"Action type {action_type.value} always requires approval"
+
+        # Check if action type is auto-approvable
+        if action_type not in self.config.auto_approvable:
+            return False, f"Action type {action_type.value} is not auto-approvable"
+
         # Check severity
-        if event.severity.value == "critical":
+        severity = event.severity
+        if severity is EventSeverity.CRITICAL:
             return False, "Critical severity requires manual approval"
 
         # Auto-approve info severity
-        if event.severity.value == self.config.auto_approve_severity:
-            return True, f"Auto-approved due to {event.severity.value} severity"
+        if severity.value == self.config.auto_approve_severity:
+            return True, f"Auto-approved due to {severity.value} severity"
 
         # Check runbook auto-remediation flag
         if analysis.runbook_id:
@@ -249,37 +275,31 @@ class ApprovalService:
         if not request:
             raise ValueError(f"Approval request {request_id} not found")
 
-        if request.status != ApprovalStatus.PENDING:
+        if request.status is not ApprovalStatus.PENDING:
             raise ValueError(f"Request {request_id} is not pending (status: {request.status})")
 
-        request.status = ApprovalStatus.APPROVED
-        request.approved_by = approver
+        with bound_contextvars(request_id=request_id, action_type=request.action.action_type.value):
+            request.status = ApprovalStatus.APPROVED
+            request.approved_by = approver
 
-        # Remove from pending
-        del self._pending_requests[request_id]
+            # Remove from pending
+            del self._pending_requests[request_id]
 
-        # Update notification if available
-        if self._notifier and request.slack_message_ts:
-            try:
-                await self._notifier.update_approval_status(
+            # Update notification (if available) and trigger callbacks concurrently
+            notification = None
+            if self._notifier and request.slack_message is not None:
+                notification = self._notifier.update_approval_status(
                     request, approved=True, responder=approver
                 )
-            except Exception as e:
-                logger.error("Failed to update approval notification", error=str(e))
-
-        # Trigger callbacks
-        for callback in self._approval_callbacks:
-            try:
-                await callback(request)
-            except Exception as e:
-                logger.error("Approval callback error", error=str(e))
+            await self._dispatch(
+                request,
+                self._approval_callbacks,
+                "Approval callback error",
+                notification=notification,
+                notification_error="Failed to update approval notification",
+            )
 
-        logger.info(
-            "Action approved",
-            request_id=request_id,
-            approver=approver,
-            action_type=request.action.action_type.value,
-        )
+            logger.info("Action approved", approver=approver)
 
         return ApprovalResponse(
             request_id=request_id,
@@ -296,39 +316,32 @@ class ApprovalService:
         if not request:
             raise ValueError(f"Approval request {request_id} not found")
 
-        if request.status != ApprovalStatus.PENDING:
+        if request.status is not ApprovalStatus.PENDING:
             raise ValueError(f"Request {request_id} is not pending (status: {request.status})")
 
-        request.status = ApprovalStatus.REJECTED
-        request.rejected_by = rejector
-        request.rejection_reason = reason
+        with bound_contextvars(request_id=request_id, action_type=request.action.action_type.value):
+            request.status = ApprovalStatus.REJECTED
+            request.rejected_by = rejector
+            request.rejection_reason = reason
 
-        # Remove from pending
-        del self._pending_requests[request_id]
+            # Remove from pending
+            del self._pending_requests[request_id]
 
-        # Update notification if available
-        if self._notifier and request.slack_message_ts:
-            try:
-                await self._notifier.update_approval_status(
+            # Update notification (if available) and trigger callbacks concurrently
+            notification = None
+            if self._notifier and request.slack_message is not None:
+                notification = self._notifier.update_approval_status(
                     request, approved=False, responder=rejector, reason=reason
                 )
-            except Exception as e:
-                logger.error("Failed to update rejection notification", error=str(e))
-
-        # Trigger callbacks
-        for callback in self._rejection_callbacks:
-            try:
-                await callback(request)
-            except Exception as e:
-                logger.error("Rejection callback error", error=str(e))
+            await self._dispatch(
+                request,
+                self._rejection_callbacks,
+                "Rejection callback error",
+                notification=notification,
+                notification_error="Failed to update rejection notification",
+            )
 
-        logger.info(
-            "Action rejected",
-            request_id=request_id,
-            rejector=rejector,
-            reason=reason,
-            action_type=request.action.action_type.value,
-        )
+            logger.info("Action rejected", rejector=rejector, reason=reason)
 
         return ApprovalResponse(
             request_id=request_id,
@@ -337,6 +350,26 @@ class ApprovalService:
             reason=reason,
         )
 
+    @staticmethod
+    async def _dispatch(
+        request: ApprovalRequest,
+        callbacks: tuple[ApprovalCallback, ...],
+        callback_error: str,
+        notification: Awaitable[Any] | None = None,
+        notification_error: str = "",
+    ) -> None:
+        """Run a notifier update and callbacks concurrently, logging any failures."""
+        awaitables: list[Awaitable[Any]] = [callback(request) for callback in callbacks]
+        if notification is not None:
+            awaitables.append(notification)
+
+        results = await asyncio.gather(*awaitables, return_exceptions=True)
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                message = callback_error if i < len(callbacks) else notification_error
+                # Formatted by the log renderer only if the line is emitted
+                logger.error(message, exc_info=result)
+
     def get_pending_requests(self) -> list[ApprovalRequest]:
         """Get all pending approval requests."""
         return list(self._pending_requests.values())
@@ -346,44 +379,59 @@ class ApprovalService:
         return self._pending_requests.get(request_id)
 
     async def _check_expiry_loop(self) -> None:
-        """Background task to check for expired approval requests."""
+        """Background task that expires approval requests as their deadlines pass."""
         while True:
             try:
-                await asyncio.sleep(60)  # Check every minute
+                await self._wait_for_next_expiry()
                 await self._expire_old_requests()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("Expiry check error", error=str(e))
 
+    async def _wait_for_next_expiry(self) -> None:
+        """Sleep until the earliest deadline, or until a request with an earlier one arrives."""
+        self._expiry_wakeup.clear()
+        timeout = None
+        if self._expiry_heap:
+            timeout = max(0.0, self._expiry_heap[0][0] - asyncio.get_running_loop().time())
+        try:
+            await asyncio.wait_for(self._expiry_wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
+
     async def _expire_old_requests(self) -> None:
         """Expire requests that have passed their deadline."""
-        now = datetime.utcnow()
-        expired = []
-
-        for request_id, request in list(self._pending_requests.items()):
-            if request.expires_at and now > request.expires_at:
-                request.status = ApprovalStatus.EXPIRED
-                expired.append(request_id)
-                del self._pending_requests[request_id]
-
-                # Update notification
-                if self._notifier and request.slack_message_ts:
-                    try:
-                        await self._notifier.update_approval_status(
-                            request, approved=False, responder="system", reason="Request expired"
-                        )
-                    except Exception as e:
-                        logger.error("Failed to update expiry notification", error=str(e))
+        now = asyncio.get_running_loop().time()
+        expired: list[dict[str, str]] = []
+        notifications: list[Awaitable[Any]] = []
+
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, request_id = heapq.heappop(self._expiry_heap)
+            request = self._pending_requests.pop(request_id, None)
+            if request is None:
+                continue  # Already approved or rejected
+
+            request.status = ApprovalStatus.EXPIRED
+            expired.append(
+                {"request_id": request_id, "action_type": request.action.action_type.value}
+            )
 
-                logger.warning(
-                    "Approval request expired",
-                    request_id=request_id,
-                    action_type=request.action.action_type.value,
+            if self._notifier and request.slack_message is not None:
+                notifications.append(
+                    self._notifier.update_approval_status(
+                        request, approved=False, responder="system", reason="Request expired"
+                    )
                 )
 
+        # Update notifications for the whole sweep concurrently
+        for result in await asyncio.gather(*notifications, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("Failed to update expiry notification", exc_info=result)
+
+        # One log line per sweep, however many requests expired together
         if expired:
-            logger.info("Expired approval requests", count=len(expired))
+            logger.warning("Approval requests expired", count=len(expired), requests=expired)
 
 
 # Singleton instance
@@ -393,11 +441,14 @@ _approval_service: ApprovalService | None = None
 def get_approval_service() -> ApprovalService:
     """Get or create the global approval service."""
     global _approval_service
-    if _approval_service is None:
-        config = ApprovalConfig(
-            timeout_minutes=getattr(settings, "approval_timeout_minutes", 30),
-            slack_enabled=getattr(settings, "slack_enabled", True),
-            slack_channel=getattr(settings, "slack_approval_channel", "#noc-alerts"),
-        )
-        _approval_service = ApprovalService(config=config)
+    service = _approval_service
+    if service is not None:
+        return service
+
+    config = ApprovalConfig(
+        timeout_minutes=settings.approval_timeout_minutes,
+        slack_enabled=settings.slack_enabled,
+        slack_channel=settings.slack_approval_channel,
+    )
+    _approval_service = ApprovalService(config=config)
     return _approval_service
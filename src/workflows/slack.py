@@ -1,83 +1,345 @@
 """Slack integration for approval notifications."""
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any
+import time
+from functools import cache, partial
+from typing import Any, ClassVar, NamedTuple
 
+import orjson
 import structlog
 
 from src.core.config import settings
 
 logger = structlog.get_logger()
 
-# Optional Slack SDK import
+# Optional Slack SDK import (its async client runs on aiohttp)
 try:
-    from slack_sdk import WebClient
-    from slack_sdk.errors import SlackApiError  # noqa: F401
+    import aiohttp
+    from slack_sdk.errors import SlackApiError
+    from slack_sdk.web.async_client import AsyncWebClient
 
     SLACK_AVAILABLE = True
 except ImportError:
     SLACK_AVAILABLE = False
     logger.warning("slack_sdk not installed, Slack notifications disabled")
 
-# Thread pool for blocking Slack API calls
-_executor = ThreadPoolExecutor(max_workers=3)
+# Slack allows roughly one message per second per channel
+MIN_SEND_INTERVAL = 1.0
+
+# Notifications waiting for the Slack worker; further sends are dropped when full
+QUEUE_SIZE = 1000
+
+# Non-critical alerts of one severity arriving within this window share a message
+ALERT_COALESCE_WINDOW = 0.5
+MAX_COALESCED_ALERTS = 10
+# Slack rejects messages with more blocks than this
+MAX_BLOCKS = 50
+
+# Static Block Kit pieces, shared across messages (never mutated)
+_DIVIDER = {"type": "divider"}
+# severity -> (emoji, label)
+_SEVERITY_TABLE = {
+    "critical": (":rotating_light:", "CRITICAL"),
+    "warning": (":warning:", "WARNING"),
+    "info": (":information_source:", "INFO"),
+}
+
+
+def _severity_style(severity: str) -> tuple[str, str]:
+    """Look up the emoji and display label for a severity value."""
+    return _SEVERITY_TABLE.get(severity) or (":bell:", severity.upper())
+
+
+def _json_dumps(obj: Any) -> str:
+    """Encode Slack request bodies with orjson rather than the stdlib json module."""
+    return orjson.dumps(obj).decode()
+
+
+def _header(text: str) -> dict[str, Any]:
+    """Build a header block."""
+    return {"type": "header", "text": {"type": "plain_text", "text": text, "emoji": True}}
+
+
+def _mrkdwn(text: str) -> dict[str, Any]:
+    """Build a mrkdwn text object."""
+    return {"type": "mrkdwn", "text": text}
+
+
+def _section(text: str) -> dict[str, Any]:
+    """Build a section block with mrkdwn text."""
+    return {"type": "section", "text": _mrkdwn(text)}
+
+
+def _fields(*pairs: tuple[str, str]) -> dict[str, Any]:
+    """Build a section block of bold-labelled ``(label, value)`` fields."""
+    fields = [_mrkdwn(f"*{label}:*\n{value}") for label, value in pairs]
+    return {"type": "section", "fields": fields}
+
+
+class _QueuedCall(NamedTuple):
+    """A Slack API call waiting for the background worker."""
+
+    method: str
+    kwargs: dict[str, Any]
+    future: asyncio.Future[Any]
+    # (severity, title) for alerts that may be merged into one message
+    alert: tuple[str, str] | None = None
 
 
 class SlackNotifier:
     """Slack notification handler for approval workflows."""
 
+    # token -> client, so notifiers for different channels share one connection pool
+    _client_cache: ClassVar[dict[str, Any]] = {}
+    # token -> (loop, aiohttp session) attached to that token's client
+    _session_cache: ClassVar[dict[str, tuple[asyncio.AbstractEventLoop, Any]]] = {}
+
     def __init__(
         self,
         token: str | None = None,
         channel: str = "#noc-alerts",
         bot_name: str = "NOC AI Operator",
     ) -> None:
-        self.token = token or getattr(settings, "slack_token", None)
+        self.token = token or settings.slack_token
         self.channel = channel
         self.bot_name = bot_name
         self._client: Any = None
+        self._log = logger.bind(component="slack", channel=channel)
+        self._rate_lock = asyncio.Lock()
+        # channel -> monotonic time of the latest reserved send slot
+        self._last_send: dict[str, float] = {}
+        self._queue: asyncio.Queue[_QueuedCall] | None = None
+        self._worker: asyncio.Task | None = None
+        self._session: Any = None
 
         if SLACK_AVAILABLE and self.token:
-            self._client = WebClient(token=self.token)
-            logger.info("Slack notifier initialized", channel=channel)
+            client = self._client_cache.get(self.token)
+            if client is None:
+                client = self._client_cache[self.token] = AsyncWebClient(token=self.token)
+            self._client = client
+            self._log.info("Slack notifier initialized")
         else:
-            logger.warning("Slack notifier not initialized (missing token or SDK)")
+            self._log.warning("Slack notifier not initialized (missing token or SDK)")
 
     @property
     def is_available(self) -> bool:
         """Check if Slack notifications are available."""
         return self._client is not None
 
-    async def send_approval_request(self, request: Any) -> str | None:
-        """Send an approval request notification to Slack."""
+    async def _throttle(self, channel: str) -> None:
+        """Wait until the channel's next send slot, spacing sends by MIN_SEND_INTERVAL."""
+        async with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._last_send.get(channel, 0.0) + MIN_SEND_INTERVAL)
+            self._last_send[channel] = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _call(self, method: str, **kwargs: Any) -> Any:
+        """Call a Slack Web API method, paced per channel and retried once on 429."""
+        await self._throttle(kwargs["channel"])
+        try:
+            return await getattr(self._client, method)(**kwargs)
+        except SlackApiError as e:
+            if e.response.status_code != 429:
+                raise
+            retry_after = int(e.response.headers.get("Retry-After", 1))
+            self._log.warning(
+                "Slack rate limited, retrying", method=method, retry_after=retry_after
+            )
+            await asyncio.sleep(retry_after)
+            return await getattr(self._client, method)(**kwargs)
+
+    def _enqueue(
+        self, method: str, *, alert: tuple[str, str] | None = None, **kwargs: Any
+    ) -> asyncio.Future[Any] | None:
+        """Queue a Slack API call for the background worker.
+
+        Returns a future resolved with the API response (None if the call
+        failed), or None if the queue is full and the call was dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+            self._attach_session()
+            self._worker = asyncio.create_task(self._drain())
+
+        future: asyncio.Future[Any] = loop.create_future()
+        try:
+            self._queue.put_nowait(_QueuedCall(method, kwargs, future, alert))
+        except asyncio.QueueFull:
+            self._log.warning("Slack queue full, dropping notification", method=method)
+            return None
+        return future
+
+    async def _drain(self) -> None:
+        """Send queued calls in order, coalescing bursts of alerts."""
+        loop = asyncio.get_running_loop()
+        held: _QueuedCall | None = None
+        batch: list[_QueuedCall] = []
+        try:
+            while True:
+                call = held or await self._queue.get()
+                held = None
+                batch = [call]
+                if call.alert is not None:
+                    # Merged size: shared header, plus per alert a divider, title and its body
+                    blocks = len(call.kwargs["blocks"]) + 2
+                    deadline = loop.time() + ALERT_COALESCE_WINDOW
+                    while len(batch) < MAX_COALESCED_ALERTS:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            queued = await asyncio.wait_for(self._queue.get(), timeout)
+                        except TimeoutError:
+                            break
+                        blocks += len(queued.kwargs["blocks"]) + 1
+                        if (
+                            queued.alert is None
+                            or queued.alert[0] != call.alert[0]
+                            or queued.kwargs["channel"] != call.kwargs["channel"]
+                            or blocks > MAX_BLOCKS
+                        ):
+                            held = queued
+                            break
+                        batch.append(queued)
+
+                if len(batch) == 1:
+                    method, kwargs = call.method, call.kwargs
+                else:
+                    method, kwargs = self._merge(batch)
+                try:
+                    response = await self._call(method, **kwargs)
+                except Exception:
+                    # Traceback is only formatted if the line is actually emitted
+                    self._log.exception("Slack API call failed", method=method)
+                    response = None
+                for queued in batch:
+                    if not queued.future.done():
+                        queued.future.set_result(response)
+        finally:
+            # Cancelled mid-window or mid-send: release everyone waiting on these calls
+            self._release(batch)
+            if held is not None:
+                self._release([held])
+
+    @staticmethod
+    def _release(calls: list[_QueuedCall]) -> None:
+        """Resolve the futures of calls that will never be sent."""
+        for queued in calls:
+            if not queued.future.done():
+                queued.future.set_result(None)
+
+    def _merge(self, batch: list[_QueuedCall]) -> tuple[str, dict[str, Any]]:
+        """Combine queued alerts of one severity into a single message."""
+        severity = batch[0].alert[0]
+        emoji, label = _severity_style(severity)
+        blocks = [_header(f"{emoji} {len(batch)} {label} alerts")]
+        for queued in batch:
+            blocks += (_DIVIDER, _section(f"*{queued.alert[1]}*"), *queued.kwargs["blocks"][1:])
+        return "chat_postMessage", {
+            **batch[0].kwargs,
+            "text": f"{len(batch)} alerts: " + ", ".join(queued.alert[1] for queued in batch),
+            "blocks": blocks,
+        }
+
+    def _attach_session(self) -> None:
+        """Give the client a keep-alive aiohttp session on the running loop.
+
+        Without one, AsyncWebClient opens a new session (and TLS connection)
+        per call. The session also encodes request bodies with orjson.
+        """
+        if not SLACK_AVAILABLE or not isinstance(self._client, AsyncWebClient):
+            return
+        loop = asyncio.get_running_loop()
+        cached = self._session_cache.get(self.token)
+        if cached is not None and cached[0] is loop and not cached[1].closed:
+            # Opened on this loop by another notifier sharing the client
+            self._client.session = cached[1]
+            return
+
+        # The client only applies its own timeout and trust_env to sessions it creates;
+        # ssl and proxy are passed per request either way
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self._client.timeout),
+            trust_env=self._client.trust_env_in_session,
+            json_serialize=_json_dumps,
+        )
+        self._session_cache[self.token] = (loop, self._session)
+        self._client.session = self._session
+
+    async def close(self) -> None:
+        """Stop the background worker, dropping any queued notifications.
+
+        Also releases this notifier's entries in the shared client and session caches.
+        """
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._release([self._queue.get_nowait()])
+        if self._session is not None:
+            if self._client.session is self._session:
+                self._client.session = None
+            cached = self._session_cache.get(self.token)
+            if cached is not None and cached[1] is self._session:
+                del self._session_cache[self.token]
+            await self._session.close()
+            self._session = None
+        # Don't pin the client, or a session left behind on a finished loop, for
+        # the life of the process; the next notifier for the token starts afresh
+        if self._client is not None and self._client_cache.get(self.token) is self._client:
+            del self._client_cache[self.token]
+        cached = self._session_cache.get(self.token)
+        if cached is not None and (cached[0].is_closed() or cached[1].closed):
+            del self._session_cache[self.token]
+
+    async def send_approval_request(self, request: Any) -> asyncio.Future[str | None] | None:
+        """Queue an approval request notification to Slack.
+
+        Returns a future for the message timestamp (None if the post failed),
+        or None if nothing was queued.
+        """
         if not self.is_available:
-            logger.debug("Slack not available, skipping notification")
+            self._log.debug("Slack not available, skipping notification")
             return None
 
         blocks = self._build_approval_blocks(request)
 
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                _executor,
-                lambda: self._client.chat_postMessage(
-                    channel=self.channel,
-                    text=f"Approval required: {request.action.action_type.value}",
-                    blocks=blocks,
-                    username=self.bot_name,
-                ),
-            )
-            message_ts = response.get("ts")
-            logger.info(
-                "Approval request sent to Slack",
-                channel=self.channel,
-                message_ts=message_ts,
-            )
-            return message_ts
-        except Exception as e:
-            logger.error("Failed to send Slack notification", error=str(e))
+        future = self._enqueue(
+            "chat_postMessage",
+            channel=self.channel,
+            text=f"Approval required: {request.action.action_type.value}",
+            blocks=blocks,
+            username=self.bot_name,
+        )
+        if future is None:
+            return None
+        return asyncio.ensure_future(self._message_ts(future))
+
+    async def _message_ts(self, future: asyncio.Future[Any]) -> str | None:
+        """Wait for a queued post and return its message timestamp."""
+        response = await future
+        if response is None:
+            return None
+
+        message_ts = response.get("ts")
+        self._log.info("Approval request sent to Slack", message_ts=message_ts)
+        return message_ts
+
+    @staticmethod
+    async def _sent_ts(future: asyncio.Future[Any] | None) -> str | None:
+        """Wait for a queued post and return its message timestamp, if it was sent."""
+        if future is None:
             return None
+        response = await future
+        return response.get("ts") if response else None
 
     async def update_approval_status(
         self,
@@ -86,189 +348,167 @@ class SlackNotifier:
         responder: str,
         reason: str | None = None,
     ) -> bool:
-        """Update an approval request message with the result."""
-        if not self.is_available or not request.slack_message_ts:
+        """Queue an update of an approval request message with the result.
+
+        Never waits for the original post: if it is still queued, the update
+        is queued once its timestamp arrives. Returns whether the update was
+        queued or scheduled.
+        """
+        if not self.is_available:
             return False
 
-        blocks = self._build_result_blocks(request, approved, responder, reason)
+        posted = request.slack_message
+        if request.slack_message_ts is None and posted is not None:
+            if not posted.done():
+                # The original post is still queued; edit it once its timestamp arrives
+                posted.add_done_callback(
+                    partial(self._on_approval_posted, request, approved, responder, reason)
+                )
+                return True
+            if posted.cancelled() or posted.exception() is not None:
+                return False
+            request.slack_message_ts = posted.result()
+        return self._enqueue_status_update(request, approved, responder, reason)
+
+    def _on_approval_posted(
+        self,
+        request: Any,
+        approved: bool,
+        responder: str,
+        reason: str | None,
+        posted: asyncio.Future[str | None],
+    ) -> None:
+        """Queue a deferred status update once the approval post has been sent."""
+        if posted.cancelled() or posted.exception() is not None:
+            return
+        request.slack_message_ts = posted.result()
+        self._enqueue_status_update(request, approved, responder, reason)
 
-        try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                _executor,
-                lambda: self._client.chat_update(
-                    channel=self.channel,
-                    ts=request.slack_message_ts,
-                    text=f"Action {'approved' if approved else 'rejected'}: {request.action.action_type.value}",
-                    blocks=blocks,
-                ),
-            )
-            logger.info(
-                "Approval status updated in Slack",
-                approved=approved,
-                responder=responder,
-            )
-            return True
-        except Exception as e:
-            logger.error("Failed to update Slack message", error=str(e))
+    def _enqueue_status_update(
+        self,
+        request: Any,
+        approved: bool,
+        responder: str,
+        reason: str | None,
+    ) -> bool:
+        """Queue the chat_update editing an approval message, if it was posted."""
+        if not request.slack_message_ts:
             return False
 
+        blocks = self._build_result_blocks(request, approved, responder, reason)
+
+        future = self._enqueue(
+            "chat_update",
+            channel=self.channel,
+            ts=request.slack_message_ts,
+            text=f"Action {'approved' if approved else 'rejected'}: {request.action.action_type.value}",
+            blocks=blocks,
+        )
+        return future is not None
+
     async def send_action_result(
         self,
         action: Any,
         success: bool,
         details: str | None = None,
     ) -> str | None:
-        """Send an action execution result notification."""
+        """Send an action execution result notification.
+
+        Waits for the queued post; returns its message timestamp, or None.
+        """
+        return await self._sent_ts(self.post_action_result(action, success, details))
+
+    def post_action_result(
+        self,
+        action: Any,
+        success: bool,
+        details: str | None = None,
+    ) -> asyncio.Future[Any] | None:
+        """Queue an action execution result notification without waiting for it.
+
+        Returns a future for the API response, or None if nothing was queued.
+        """
         if not self.is_available:
             return None
 
         status_emoji = ":white_check_mark:" if success else ":x:"
 
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{status_emoji} Action {'Completed' if success else 'Failed'}",
-                    "emoji": True,
-                },
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Action:*\n{action.action_type.value}",
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Status:*\n{'Success' if success else 'Failed'}",
-                    },
-                ],
-            },
+            _header(f"{status_emoji} Action {'Completed' if success else 'Failed'}"),
+            _fields(
+                ("Action", action.action_type.value),
+                ("Status", "Success" if success else "Failed"),
+            ),
         ]
 
         if details:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Details:*\n```{details[:2000]}```",
-                },
-            })
+            blocks.append(_section(f"*Details:*\n```{details[:2000]}```"))
 
         if action.error:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Error:*\n```{action.error[:1000]}```",
-                },
-            })
-
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                _executor,
-                lambda: self._client.chat_postMessage(
-                    channel=self.channel,
-                    text=f"Action {'completed' if success else 'failed'}: {action.action_type.value}",
-                    blocks=blocks,
-                    username=self.bot_name,
-                ),
-            )
-            return response.get("ts")
-        except Exception as e:
-            logger.error("Failed to send action result to Slack", error=str(e))
-            return None
+            blocks.append(_section(f"*Error:*\n```{action.error[:1000]}```"))
+
+        return self._enqueue(
+            "chat_postMessage",
+            channel=self.channel,
+            text=f"Action {'completed' if success else 'failed'}: {action.action_type.value}",
+            blocks=blocks,
+            username=self.bot_name,
+        )
 
     async def send_alert(
         self,
         event: Any,
         analysis: Any | None = None,
     ) -> str | None:
-        """Send an alert notification to Slack."""
+        """Send an alert notification to Slack.
+
+        Waits for the queued post; returns its message timestamp, or None.
+        """
+        return await self._sent_ts(self.post_alert(event, analysis))
+
+    def post_alert(
+        self,
+        event: Any,
+        analysis: Any | None = None,
+    ) -> asyncio.Future[Any] | None:
+        """Queue an alert notification to Slack without waiting for it.
+
+        Returns a future for the API response, or None if nothing was queued.
+        """
         if not self.is_available:
             return None
 
-        severity_emoji = {
-            "critical": ":rotating_light:",
-            "warning": ":warning:",
-            "info": ":information_source:",
-        }.get(event.severity.value, ":bell:")
+        severity_emoji, severity_label = _severity_style(event.severity.value)
 
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{severity_emoji} {event.title}",
-                    "emoji": True,
-                },
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Severity:*\n{event.severity.value.upper()}",
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Source:*\n{event.source.value}",
-                    },
-                ],
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Description:*\n{event.description[:500]}",
-                },
-            },
+            _header(f"{severity_emoji} {event.title}"),
+            _fields(
+                ("Severity", severity_label),
+                ("Source", event.source.value),
+            ),
+            _section(f"*Description:*\n{event.description[:500]}"),
         ]
 
         if analysis:
-            blocks.extend([
-                {"type": "divider"},
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*AI Analysis:*\n{analysis.summary}",
-                    },
-                },
-                {
-                    "type": "section",
-                    "fields": [
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Confidence:*\n{analysis.confidence:.0%}",
-                        },
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Actions:*\n{', '.join(a.value for a in analysis.suggested_actions)}",
-                        },
-                    ],
-                },
-            ])
-
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                _executor,
-                lambda: self._client.chat_postMessage(
-                    channel=self.channel,
-                    text=f"Alert: {event.title}",
-                    blocks=blocks,
-                    username=self.bot_name,
+            blocks += (
+                _DIVIDER,
+                _section(f"*AI Analysis:*\n{analysis.summary}"),
+                _fields(
+                    ("Confidence", f"{analysis.confidence:.0%}"),
+                    ("Actions", ", ".join(analysis.suggested_action_values)),
                 ),
             )
-            return response.get("ts")
-        except Exception as e:
-            logger.error("Failed to send alert to Slack", error=str(e))
-            return None
+
+        severity = event.severity.value
+        return self._enqueue(
+            "chat_postMessage",
+            # Critical alerts go out on their own, without waiting for the window
+            alert=None if severity == "critical" else (severity, event.title),
+            channel=self.channel,
+            text=f"Alert: {event.title}",
+            blocks=blocks,
+            username=self.bot_name,
+        )
 
     def _build_approval_blocks(self, request: Any) -> list[dict[str, Any]]:
         """Build Slack blocks for an approval request."""
@@ -276,71 +516,27 @@ class SlackNotifier:
         action = request.action
         analysis = request.analysis
 
-        severity_emoji = {
-            "critical": ":rotating_light:",
-            "warning": ":warning:",
-            "info": ":information_source:",
-        }.get(event.severity.value, ":bell:")
+        severity_emoji, severity_label = _severity_style(event.severity.value)
 
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{severity_emoji} Approval Required",
-                    "emoji": True,
-                },
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Alert:* {event.title}",
-                },
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Severity:*\n{event.severity.value.upper()}",
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Source:*\n{event.source.value}",
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Action:*\n`{action.action_type.value}`",
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Confidence:*\n{analysis.confidence:.0%}",
-                    },
-                ],
-            },
-            {"type": "divider"},
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*AI Analysis:*\n{analysis.summary}",
-                },
-            },
+            _header(f"{severity_emoji} Approval Required"),
+            _section(f"*Alert:* {event.title}"),
+            _fields(
+                ("Severity", severity_label),
+                ("Source", event.source.value),
+                ("Action", f"`{action.action_type.value}`"),
+                ("Confidence", f"{analysis.confidence:.0%}"),
+            ),
+            _DIVIDER,
+            _section(f"*AI Analysis:*\n{analysis.summary}"),
         ]
 
         if analysis.root_cause:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Root Cause:*\n{analysis.root_cause}",
-                },
-            })
+            blocks.append(_section(f"*Root Cause:*\n{analysis.root_cause}"))
 
         # Add action buttons
-        blocks.extend([
-            {"type": "divider"},
+        blocks += (
+            _DIVIDER,
             {
                 "type": "actions",
                 "block_id": f"approval_{request.id}",
@@ -372,13 +568,12 @@ class SlackNotifier:
             {
                 "type": "context",
                 "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"Request ID: `{request.id}` | Expires: {request.expires_at.strftime('%Y-%m-%d %H:%M UTC') if request.expires_at else 'Never'}",
-                    },
+                    _mrkdwn(
+                        f"Request ID: `{request.id}` | Expires: {request.expires_at.strftime('%Y-%m-%d %H:%M UTC') if request.expires_at else 'Never'}"
+                    ),
                 ],
             },
-        ])
+        )
 
         return blocks
 
@@ -397,68 +592,26 @@ class SlackNotifier:
         action = request.action
 
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"{status_emoji} Action {status_text}",
-                    "emoji": True,
-                },
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Alert:* {event.title}",
-                },
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Action:*\n`{action.action_type.value}`",
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*{status_text} by:*\n{responder}",
-                    },
-                ],
-            },
+            _header(f"{status_emoji} Action {status_text}"),
+            _section(f"*Alert:* {event.title}"),
+            _fields(
+                ("Action", f"`{action.action_type.value}`"),
+                (f"{status_text} by", responder),
+            ),
         ]
 
         if reason:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Reason:*\n{reason}",
-                },
-            })
-
-        blocks.append({
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": f"Request ID: `{request.id}`",
-                },
-            ],
-        })
-
-        return blocks
+            blocks.append(_section(f"*Reason:*\n{reason}"))
 
+        blocks.append({"type": "context", "elements": [_mrkdwn(f"Request ID: `{request.id}`")]})
 
-# Singleton instance
-_slack_notifier: SlackNotifier | None = None
+        return blocks
 
 
+@cache
 def get_slack_notifier() -> SlackNotifier:
     """Get or create the global Slack notifier."""
-    global _slack_notifier
-    if _slack_notifier is None:
-        _slack_notifier = SlackNotifier(
-            token=getattr(settings, "slack_token", None),
-            channel=getattr(settings, "slack_approval_channel", "#noc-alerts"),
-        )
-    return _slack_notifier
+    return SlackNotifier(
+        token=settings.slack_token,
+        channel=settings.slack_approval_channel,
+    )
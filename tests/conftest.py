@@ -0,0 +1,16 @@
+"""Shared test fixtures."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.ai.rag import get_knowledge_base
+from src.api.app import create_app
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Create a test client shared by the tests in a module."""
+    app = create_app()
+    # The lifespan (which also starts the event processor) is not run here
+    app.state.knowledge_base = get_knowledge_base()
+    return TestClient(app)
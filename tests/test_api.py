@@ -1,16 +1,6 @@
 """Tests for API endpoints."""
 
-import pytest
-from fastapi.testclient import TestClient
-
-from src.api.app import create_app
-
-
-@pytest.fixture
-def client():
-    """Create test client fixture."""
-    app = create_app()
-    return TestClient(app)
+import json
 
 
 def test_health_check(client):
@@ -88,3 +78,47 @@ def test_list_actions(client):
     data = response.json()
     assert "count" in data
     assert "actions" in data
+
+
+def test_import_runbooks(client):
+    """Test bulk runbook import counts invalid entries as errors."""
+    payload = {
+        "runbooks": [
+            {"id": "imported-runbook", "title": "Imported", "tags": ["imported"]},
+            {"title": "Missing ID"},
+            {"id": "bad-tags", "title": "Bad tags", "tags": 5},
+            {"id": "null-patterns", "title": "Null patterns", "alert_patterns": None},
+            "not a runbook",
+        ]
+    }
+    files = {"file": ("runbooks.json", json.dumps(payload), "application/json")}
+    response = client.post("/api/v1/knowledge/import", files=files)
+    assert response.status_code == 200
+    assert response.json() == {"imported": 1, "errors": 4}
+    assert client.get("/api/v1/knowledge/runbooks/imported-runbook").status_code == 200
+    assert client.get("/api/v1/knowledge/runbooks/bad-tags").status_code == 404
+
+
+def test_export_runbooks(client):
+    """Test runbook export returns every runbook with a count."""
+    response = client.get("/api/v1/knowledge/export")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == len(data["runbooks"]) > 0
+    assert {"id", "title", "alert_patterns"} <= data["runbooks"][0].keys()
+
+
+def test_import_runbooks_invalid_json(client):
+    """Test malformed import files are rejected."""
+    for body in ("{not json", '{"runbooks": 5}', "42"):
+        files = {"file": ("runbooks.json", body, "application/json")}
+        response = client.post("/api/v1/knowledge/import", files=files)
+        assert response.status_code == 400
+
+
+def test_dashboard_stats(client):
+    """Test the dashboard page and stats partial render the processor counts."""
+    assert client.get("/dashboard/").status_code == 200
+    response = client.get("/dashboard/stats")
+    assert response.status_code == 200
+    assert "Total Events" in response.text
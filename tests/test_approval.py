@@ -0,0 +1,114 @@
+"""Tests for the approval workflow."""
+
+import asyncio
+
+import pytest
+
+from src.core.models import (
+    ActionType,
+    AIAnalysis,
+    Event,
+    EventSeverity,
+    EventSource,
+    RemediationAction,
+)
+from src.workflows.approval import ApprovalConfig, ApprovalService, ApprovalStatus
+
+
+@pytest.fixture
+def event():
+    """Create sample event fixture."""
+    return Event(
+        id="test-event-001",
+        source=EventSource.ALERTMANAGER,
+        severity=EventSeverity.WARNING,
+        title="Disk full",
+        description="Root filesystem is full",
+    )
+
+
+def make_request_args(event, action_id):
+    """Build the arguments for an approval request that always needs a human."""
+    action = RemediationAction(
+        id=action_id,
+        event_id=event.id,
+        action_type=ActionType.SSH_COMMAND,
+        confidence=0.9,
+    )
+    analysis = AIAnalysis(
+        event_id=event.id,
+        summary="Disk full",
+        suggested_actions=[ActionType.SSH_COMMAND],
+        confidence=0.9,
+        reasoning="Clean up old logs",
+    )
+    return {"action": action, "event": event, "analysis": analysis}
+
+
+@pytest.mark.asyncio
+async def test_pending_requests_expire_at_deadline(event):
+    """Test requests expire once their deadline passes, skipping decided ones."""
+    service = ApprovalService(config=ApprovalConfig(timeout_minutes=0))
+    await service.start()
+    try:
+        approved = await service.request_approval(**make_request_args(event, "action-1"))
+        await service.approve(approved.id, approver="alice")
+        pending = await service.request_approval(**make_request_args(event, "action-2"))
+        await asyncio.sleep(0.05)
+    finally:
+        await service.stop()
+
+    assert approved.status == ApprovalStatus.APPROVED
+    assert pending.status == ApprovalStatus.EXPIRED
+    assert service.get_pending_requests() == []
+
+
+def test_check_auto_approve(event):
+    """Test auto-approval honours the per-action-type policy."""
+    service = ApprovalService()
+    args = make_request_args(event, "action-1")
+    assert service._check_auto_approve(**args)[0] is False
+
+    args["action"].action_type = ActionType.K8S_RESTART_POD
+    assert service._check_auto_approve(**args)[0] is True
+
+    args["analysis"].confidence = 0.5
+    assert service._check_auto_approve(**args)[0] is False
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_block_others(event):
+    """Test every approval callback runs even if one of them fails."""
+    service = ApprovalService()
+    called = []
+
+    async def failing(request):
+        raise RuntimeError("boom")
+
+    async def recording(request):
+        called.append(request.id)
+
+    service.on_approval(failing)
+    service.on_approval(recording)
+
+    request = await service.request_approval(**make_request_args(event, "action-1"))
+    await service.approve(request.id, approver="alice")
+    assert called == [request.id]
+
+
+@pytest.mark.asyncio
+async def test_callbacks_fixed_once_started():
+    """Test callbacks cannot be registered while the service is running."""
+    service = ApprovalService()
+
+    async def callback(request):
+        pass
+
+    service.on_approval(callback)
+    await service.start()
+    try:
+        with pytest.raises(RuntimeError):
+            service.on_rejection(callback)
+    finally:
+        await service.stop()
+    assert service._approval_callbacks == (callback,)
@@ -1,14 +1,18 @@
 """Tests for event processor."""
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 
 from src.core.event_processor import EventProcessor
 from src.core.models import (
-    ActionStatus,
     ActionType,
+    AIAnalysis,
     Event,
     EventSeverity,
     EventSource,
+    RemediationAction,
 )
 
 
@@ -52,6 +56,16 @@ async def test_list_events(processor, sample_event):
     assert events[0].id == "test-event-001"
 
 
+@pytest.mark.asyncio
+async def test_list_events_projection(processor, sample_event):
+    """Test event rows carry only the rendered fields as plain values."""
+    await processor.submit_event(sample_event)
+    [row] = processor.list_events_projection()
+    assert row["id"] == "test-event-001"
+    assert row["severity"] == sample_event.severity.value
+    assert set(row) == {"id", "title", "source", "severity", "timestamp"}
+
+
 def test_register_handler(processor):
     """Test action handler registration."""
 
@@ -75,3 +89,251 @@ async def test_event_generates_id(processor):
     event_id = await processor.submit_event(event)
     assert event_id != ""
     assert len(event_id) == 36  # UUID length
+
+
+@pytest.mark.asyncio
+async def test_event_store_is_bounded():
+    """Test the oldest events are evicted along with their actions."""
+    processor = EventProcessor(max_events=2)
+    for i in range(3):
+        await processor.submit_event(
+            Event(
+                id=f"event-{i}",
+                source=EventSource.CUSTOM,
+                severity=EventSeverity.INFO,
+                title=f"Event {i}",
+                description="Test description",
+            )
+        )
+    processor._store_action(
+        RemediationAction(
+            id="action-1",
+            event_id="event-1",
+            action_type=ActionType.NO_ACTION,
+            confidence=0.9,
+        )
+    )
+
+    assert [e.id for e in processor.list_events()] == ["event-2", "event-1"]
+    assert processor.get_event("event-0") is None
+    assert [a.id for a in processor.get_actions_for_event("event-1")] == ["action-1"]
+
+    await processor.submit_event(
+        Event(
+            id="event-3",
+            source=EventSource.CUSTOM,
+            severity=EventSeverity.INFO,
+            title="Event 3",
+            description="Test description",
+        )
+    )
+    assert processor.get_action("action-1") is None
+    assert processor.get_actions_for_event("event-1") == []
+    assert processor.get_stats()["pending_actions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_track_status_transitions(processor):
+    """Test action status counters follow approvals and rejections."""
+    for action_id in ("action-1", "action-2"):
+        processor._store_action(
+            RemediationAction(
+                id=action_id,
+                event_id="test-event-001",
+                action_type=ActionType.K8S_RESTART_POD,
+                confidence=0.9,
+            )
+        )
+    assert processor.get_stats()["pending_actions"] == 2
+
+    await processor.reject_action("action-1")
+    stats = processor.get_stats()
+    assert stats["pending_actions"] == 1
+    assert stats["total_actions"] == 2
+    assert stats["failed_actions"] == 0
+    assert processor.stats_snapshot().pending_actions == 1
+
+
+@pytest.mark.asyncio
+async def test_start_is_idempotent(processor):
+    """Test repeated starts share a single processing loop."""
+    await processor.start()
+    task = processor._task
+    await processor.start()
+    assert processor._task is task
+
+    await processor.stop()
+    await processor.start()
+    assert processor._task is task
+
+    await processor.stop()
+    await asyncio.wait_for(task, timeout=2)
+    assert task.done()
+
+
+@pytest.mark.asyncio
+async def test_process_loop_analyzes_events_concurrently():
+    """Test queued events are analyzed concurrently up to the limit."""
+    processor = EventProcessor(max_concurrency=2)
+
+    class FakeAnalyzer:
+        active = 0
+        peak = 0
+
+        async def analyze(self, event):
+            FakeAnalyzer.active += 1
+            FakeAnalyzer.peak = max(FakeAnalyzer.peak, FakeAnalyzer.active)
+            await asyncio.sleep(0.01)
+            FakeAnalyzer.active -= 1
+            return AIAnalysis(
+                event_id=event.id,
+                summary="Test",
+                suggested_actions=[],
+                confidence=0.9,
+                reasoning="Test",
+            )
+
+    processor.analyzer = FakeAnalyzer()
+    for i in range(4):
+        await processor.submit_event(
+            Event(
+                id=f"event-{i}",
+                source=EventSource.CUSTOM,
+                severity=EventSeverity.INFO,
+                title=f"Event {i}",
+                description="Test description",
+            )
+        )
+
+    await processor.start()
+    for _ in range(100):
+        if all(processor.get_analysis(f"event-{i}") for i in range(4)):
+            break
+        await asyncio.sleep(0.01)
+    await processor.stop()
+
+    assert all(processor.get_analysis(f"event-{i}") for i in range(4))
+    assert FakeAnalyzer.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_alerts_reuse_analysis(processor, sample_event):
+    """Test repeated alerts are served from the analysis cache."""
+    calls = []
+
+    class FakeAnalyzer:
+        async def analyze(self, event):
+            calls.append(event.id)
+            return AIAnalysis(
+                event_id=event.id,
+                summary="Test",
+                suggested_actions=[ActionType.NO_ACTION],
+                confidence=0.9,
+                reasoning="Test",
+            )
+
+    processor.analyzer = FakeAnalyzer()
+    repeat = sample_event.model_copy(update={"id": "test-event-002"})
+
+    first = await processor._analyze(sample_event)
+    second = await processor._analyze(repeat)
+
+    assert calls == ["test-event-001"]
+    assert first.event_id == "test-event-001"
+    assert second.event_id == "test-event-002"
+    assert second.summary == first.summary
+
+
+@pytest.mark.asyncio
+async def test_knowledge_base_change_invalidates_analysis(processor, sample_event):
+    """Test a cached analysis is dropped once the knowledge base generation moves."""
+    calls = []
+
+    class FakeAnalyzer:
+        async def analyze(self, event):
+            calls.append(event.id)
+            return AIAnalysis(
+                event_id=event.id,
+                summary="Test",
+                suggested_actions=[ActionType.NO_ACTION],
+                confidence=0.9,
+                reasoning="Test",
+            )
+
+    knowledge_base = SimpleNamespace(generation=1)
+    processor.analyzer = FakeAnalyzer()
+    processor.set_knowledge_base(knowledge_base)
+
+    await processor._analyze(sample_event)
+    await processor._analyze(sample_event.model_copy(update={"id": "test-event-002"}))
+    knowledge_base.generation += 1
+    await processor._analyze(sample_event.model_copy(update={"id": "test-event-003"}))
+
+    assert calls == ["test-event-001", "test-event-003"]
+
+@pytest.mark.asyncio
+async def test_cancelled_analysis_releases_followers(processor, sample_event):
+    """Test identical alerts waiting on a cancelled analysis are not left hanging."""
+    started = asyncio.Event()
+
+    class SlowAnalyzer:
+        async def analyze(self, event):
+            started.set()
+            await asyncio.sleep(10)
+
+    processor.analyzer = SlowAnalyzer()
+    repeat = sample_event.model_copy(update={"id": "test-event-002"})
+
+    leader = asyncio.create_task(processor._analyze(sample_event))
+    await started.wait()
+    follower = asyncio.create_task(processor._analyze(repeat))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(follower, timeout=1)
+    assert processor._inflight_analyses == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_event_does_not_block_later_events():
+    """Test events queued behind a slow analysis are processed while it is pending."""
+    processor = EventProcessor(max_concurrency=2)
+    release = asyncio.Event()
+
+    class FakeAnalyzer:
+        async def analyze(self, event):
+            if event.id == "slow":
+                await release.wait()
+            return AIAnalysis(
+                event_id=event.id,
+                summary="Test",
+                suggested_actions=[],
+                confidence=0.9,
+                reasoning="Test",
+            )
+
+    def make(event_id):
+        return Event(
+            id=event_id,
+            source=EventSource.CUSTOM,
+            severity=EventSeverity.INFO,
+            title=event_id,
+            description="Test description",
+        )
+
+    processor.analyzer = FakeAnalyzer()
+    await processor.start()
+    try:
+        for event_id in ("slow", "fast-1", "fast-2", "fast-3"):
+            await processor.submit_event(make(event_id))
+        for _ in range(100):
+            if all(processor.get_analysis(f"fast-{i}") for i in (1, 2, 3)):
+                break
+            await asyncio.sleep(0.01)
+
+        assert all(processor.get_analysis(f"fast-{i}") for i in (1, 2, 3))
+        assert processor.get_analysis("slow") is None
+    finally:
+        release.set()
+        await processor.stop()
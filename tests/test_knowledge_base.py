@@ -0,0 +1,165 @@
+"""Tests for the runbook knowledge base."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.ai.rag import (
+    EmbeddingBatcher,
+    InMemoryVectorIndex,
+    RunbookEntry,
+    SearchCache,
+    VectorKnowledgeBase,
+)
+
+
+@pytest.fixture
+def kb():
+    """Create an empty knowledge base fixture."""
+    return VectorKnowledgeBase()
+
+
+@pytest.fixture
+def sample_runbook():
+    """Create sample runbook fixture."""
+    return RunbookEntry(
+        id="test-runbook",
+        title="Test Runbook",
+        alert_patterns=["disk full"],
+        content="Test content",
+        remediation_steps=["Clean up"],
+        tags=["Storage", "disk"],
+    )
+
+
+def test_list_runbooks_by_tag(kb, sample_runbook):
+    """Test tag filtering is case-insensitive."""
+    kb.add_runbook(sample_runbook)
+    assert [rb.id for rb in kb.list_runbooks(tag="storage")] == ["test-runbook"]
+    assert [rb.id for rb in kb.list_runbooks(tag="DISK")] == ["test-runbook"]
+    assert kb.list_runbooks(tag="network") == []
+
+
+def test_list_tags_tracks_removal(kb, sample_runbook):
+    """Test the tag set is maintained on add and remove."""
+    kb.add_runbook(sample_runbook)
+    assert kb.list_tags() == ["disk", "storage"]
+
+    kb.remove_runbook(sample_runbook.id)
+    assert kb.list_tags() == []
+    assert kb.list_runbooks(tag="disk") == []
+
+
+def test_search_cache_invalidated_on_change(kb, sample_runbook):
+    """Test cached results are dropped when the knowledge base changes."""
+    cache = SearchCache()
+    key = SearchCache.make_key("disk full on node", None, 5, True)
+    kb.add_runbook(sample_runbook)
+
+    results = kb.search("disk full on node")
+    cache.put(key, results, kb.generation)
+    assert cache.get(key, kb.generation) is results
+
+    kb.remove_runbook(sample_runbook.id)
+    assert cache.get(key, kb.generation) is None
+
+
+def test_search_cache_semantic_hit():
+    """Test near-duplicate query embeddings are served from cache."""
+    np = pytest.importorskip("numpy")
+    cache = SearchCache(similarity_threshold=0.95)
+    key = SearchCache.make_key("disk is full", None, 5, True)
+    cache.put(key, [], 0, embedding=np.array([1.0, 0.0, 0.1]))
+
+    paraphrase = SearchCache.make_key("the disk is full", None, 5, True)
+    assert cache.get_similar(paraphrase, np.array([1.0, 0.0, 0.12]), 0) == []
+
+    other_top_k = SearchCache.make_key("the disk is full", None, 3, True)
+    assert cache.get_similar(other_top_k, np.array([1.0, 0.0, 0.12]), 0) is None
+    assert cache.get_similar(paraphrase, np.array([0.0, 1.0, 0.0]), 0) is None
+
+
+def test_add_runbooks_bulk_deduplicates(kb, sample_runbook):
+    """Test bulk insert collapses duplicate IDs and indexes every runbook."""
+    other = RunbookEntry(
+        id="other-runbook",
+        title="Other Runbook",
+        alert_patterns=["link down"],
+        content="Other content",
+        remediation_steps=[],
+        tags=["network"],
+    )
+    assert kb.add_runbooks_bulk([sample_runbook, other, sample_runbook]) == 2
+    assert len(kb.list_runbooks()) == 2
+    assert [r.runbook.id for r in kb.pattern_search("eth0 link down")] == ["other-runbook"]
+
+
+
+def test_bulk_insert_in_thread_alongside_writes(kb, sample_runbook):
+    """Test a threaded bulk insert and writes on the caller leave consistent indexes."""
+    bulk = [
+        RunbookEntry(
+            id=f"bulk-{i}",
+            title=f"Bulk {i}",
+            alert_patterns=[f"pattern {i}", "disk full"],
+            content="",
+            remediation_steps=[],
+            tags=["bulk", "disk"],
+        )
+        for i in range(2000)
+    ]
+    worker = threading.Thread(target=kb.add_runbooks_bulk, args=(bulk,))
+    worker.start()
+    while worker.is_alive():
+        kb.add_runbook(sample_runbook)
+        kb.remove_runbook(sample_runbook.id)
+    worker.join()
+
+    assert len(kb.list_runbooks()) == 2000
+    assert kb.list_tags() == ["bulk", "disk"]
+    assert len(kb.pattern_search("disk full")) == 2000
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_batches_concurrent_requests():
+    """Test concurrent submissions are encoded in a single call."""
+
+    class FakeEmbedder:
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, texts, batch_size, convert_to_numpy):
+            self.calls.append(list(texts))
+            return [len(text) for text in texts]
+
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=50)
+    try:
+        results = await asyncio.gather(*(batcher.submit(t) for t in ["a", "bb", "ccc"]))
+    finally:
+        await batcher.close()
+
+    assert results == [1, 2, 3]
+    assert embedder.calls == [["a", "bb", "ccc"]]
+
+
+def test_pattern_search_after_removal(kb, sample_runbook):
+    """Test pattern matches track runbook additions and removals."""
+    kb.add_runbook(sample_runbook)
+    assert [r.runbook.id for r in kb.pattern_search("DISK FULL on /var")] == ["test-runbook"]
+
+    kb.remove_runbook(sample_runbook.id)
+    assert kb.pattern_search("disk full on /var") == []
+
+
+def test_in_memory_vector_index_top_k():
+    """Test the in-memory index ranks by cosine similarity and tracks deletes."""
+    np = pytest.importorskip("numpy")
+    index = InMemoryVectorIndex()
+    index.upsert(["a", "b", "c"], np.array([[1.0, 0.0], [0.6, 0.8], [0.0, 2.0]]))
+
+    assert [vector_id for vector_id, _ in index.query([1.0, 0.1], top_k=2)] == ["a", "b"]
+    assert index.query([0.0, 1.0], top_k=1) == [("c", pytest.approx(1.0))]
+
+    index.delete("c")
+    assert [vector_id for vector_id, _ in index.query([0.0, 1.0], top_k=5)] == ["b", "a"]
@@ -2,6 +2,7 @@
 
 from src.core.models import (
     ActionType,
+    AIAnalysis,
     Event,
     EventSeverity,
     EventSource,
@@ -29,3 +30,16 @@ def test_action_types():
     """Test action type enum."""
     assert ActionType.K8S_RESTART_POD.value == "k8s_restart_pod"
     assert ActionType.ESCALATE.value == "escalate"
+
+
+def test_analysis_suggested_action_values():
+    """Test suggested action values are exposed as strings and not dumped."""
+    analysis = AIAnalysis(
+        event_id="test-123",
+        summary="Pod crashing",
+        suggested_actions=[ActionType.K8S_RESTART_POD, ActionType.ESCALATE],
+        confidence=0.9,
+        reasoning="CrashLoopBackOff",
+    )
+    assert analysis.suggested_action_values == ("k8s_restart_pod", "escalate")
+    assert "suggested_action_values" not in analysis.model_dump()
@@ -0,0 +1,194 @@
+"""Tests for Slack notifications."""
+
+import asyncio
+
+import pytest
+
+from src.core.models import (
+    ActionType,
+    AIAnalysis,
+    Event,
+    EventSeverity,
+    EventSource,
+    RemediationAction,
+)
+from src.workflows import slack
+from src.workflows.approval import ApprovalService
+from src.workflows.slack import SlackNotifier
+
+
+class FakeClient:
+    """Records the loop time and arguments of each Slack API call."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def chat_postMessage(self, **kwargs):  # noqa: N802
+        self.calls.append((asyncio.get_running_loop().time(), kwargs))
+        return {"ts": str(len(self.calls))}
+
+    async def chat_update(self, **kwargs):  # noqa: N802
+        self.calls.append((asyncio.get_running_loop().time(), kwargs))
+        return {"ts": kwargs["ts"]}
+
+
+@pytest.fixture
+def notifier():
+    """Create a Slack notifier backed by a fake client."""
+    notifier = SlackNotifier(token=None)
+    notifier._client = FakeClient()
+    yield notifier
+    SlackNotifier._client_cache.clear()
+    SlackNotifier._session_cache.clear()
+
+
+def make_event(severity, title="Test"):
+    """Build a custom event with the given severity and title."""
+    return Event(
+        source=EventSource.CUSTOM,
+        severity=severity,
+        title=title,
+        description="Test description",
+    )
+
+
+@pytest.mark.asyncio
+async def test_sends_are_paced_per_channel(monkeypatch, notifier):
+    """Test concurrent sends to one channel are spaced by the minimum interval."""
+    monkeypatch.setattr(slack, "MIN_SEND_INTERVAL", 0.05)
+    action = RemediationAction(
+        event_id="event-1",
+        action_type=ActionType.K8S_RESTART_POD,
+        confidence=0.9,
+    )
+
+    try:
+        message_ts = await asyncio.gather(
+            *(notifier.send_action_result(action, success=True) for _ in range(3))
+        )
+    finally:
+        await notifier.close()
+
+    assert message_ts == ["1", "2", "3"]
+    times = [t for t, _ in notifier._client.calls]
+    assert all(b - a >= 0.04 for a, b in zip(times, times[1:], strict=False))
+
+
+@pytest.mark.asyncio
+async def test_alert_bursts_are_coalesced(monkeypatch, notifier):
+    """Test same-severity alerts in one window share a message; critical ones do not."""
+    monkeypatch.setattr(slack, "MIN_SEND_INTERVAL", 0)
+    monkeypatch.setattr(slack, "ALERT_COALESCE_WINDOW", 0.05)
+
+    try:
+        futures = [
+            notifier.post_alert(make_event(EventSeverity.WARNING, "Disk full")),
+            notifier.post_alert(make_event(EventSeverity.WARNING, "Link down")),
+            notifier.post_alert(make_event(EventSeverity.CRITICAL, "Node down")),
+        ]
+        responses = await asyncio.gather(*futures)
+    finally:
+        await notifier.close()
+
+    assert [response["ts"] for response in responses] == ["1", "1", "2"]
+    merged = notifier._client.calls[0][1]
+    assert merged["text"] == "2 alerts: Disk full, Link down"
+    assert merged["blocks"][0]["text"]["text"].endswith("2 WARNING alerts")
+    assert notifier._client.calls[1][1]["text"] == "Alert: Node down"
+
+
+@pytest.mark.asyncio
+async def test_close_releases_pending_sends(monkeypatch, notifier):
+    """Test closing the notifier resolves queued and in-flight sends with None."""
+    monkeypatch.setattr(slack, "MIN_SEND_INTERVAL", 10)
+    action = RemediationAction(
+        event_id="event-1",
+        action_type=ActionType.K8S_RESTART_POD,
+        confidence=0.9,
+    )
+
+    futures = [notifier.post_action_result(action, success=True) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    await notifier.close()
+
+    assert await asyncio.wait_for(asyncio.gather(*futures), timeout=1) == [
+        {"ts": "1"},
+        None,
+        None,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_close_drops_shared_client(notifier):
+    """Test closing the notifier removes its client from the shared cache."""
+    notifier.token = "xoxb-test"
+    SlackNotifier._client_cache[notifier.token] = notifier._client
+
+    await notifier.close()
+
+    assert notifier.token not in SlackNotifier._client_cache
+
+
+@pytest.mark.asyncio
+async def test_approval_post_is_off_the_critical_path(monkeypatch, notifier):
+    """Test requesting approval doesn't wait on Slack, and updates edit the posted message."""
+    monkeypatch.setattr(slack, "MIN_SEND_INTERVAL", 0.05)
+    service = ApprovalService(notifier=notifier)
+    event = make_event(EventSeverity.WARNING)
+    action = RemediationAction(
+        event_id=event.id,
+        action_type=ActionType.SSH_COMMAND,
+        confidence=0.9,
+    )
+    analysis = AIAnalysis(
+        event_id=event.id,
+        summary="Test",
+        suggested_actions=[ActionType.SSH_COMMAND],
+        confidence=0.9,
+        reasoning="Test",
+    )
+
+    try:
+        request = await service.request_approval(action, event, analysis)
+        assert request.slack_message_ts is None
+        await service.approve(request.id, approver="alice")
+        await asyncio.sleep(0.1)
+    finally:
+        await notifier.close()
+
+    assert request.slack_message_ts == "1"
+    (_, post), (_, update) = notifier._client.calls
+    assert post["text"] == "Approval required: ssh_command"
+    assert update["ts"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_approve_does_not_wait_on_backed_up_queue(monkeypatch, notifier):
+    """Test approving returns while the approval post is still queued behind pacing."""
+    monkeypatch.setattr(slack, "MIN_SEND_INTERVAL", 10)
+    service = ApprovalService(notifier=notifier)
+    event = make_event(EventSeverity.WARNING)
+    action = RemediationAction(
+        event_id=event.id,
+        action_type=ActionType.SSH_COMMAND,
+        confidence=0.9,
+    )
+    analysis = AIAnalysis(
+        event_id=event.id,
+        summary="Test",
+        suggested_actions=[ActionType.SSH_COMMAND],
+        confidence=0.9,
+        reasoning="Test",
+    )
+
+    try:
+        # Occupies the channel's send slot, so the approval post waits ~10s
+        notifier.post_action_result(action, success=True)
+        request = await service.request_approval(action, event, analysis)
+        await asyncio.wait_for(service.approve(request.id, approver="alice"), timeout=1)
+        assert not request.slack_message.done()
+    finally:
+        await notifier.close()
+
+    assert len(notifier._client.calls) == 1
+    assert await request.slack_message is None